@@ -2,6 +2,7 @@ import re
 import time
 import os
 import pickle
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any
 
 import faiss
@@ -29,6 +30,10 @@ class DocumentStore:
         from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
+        # Per-instance embedding cache: encoding a query costs tens of ms,
+        # so identical queries reuse the previous embedding
+        self._encode_query = lru_cache(maxsize=2048)(self._encode_query_uncached)
+
         # Check if index already exists
         index_path = os.path.join(db_path, "index.faiss")
         docs_path = os.path.join(db_path, "docs.pkl")
@@ -42,15 +47,38 @@ class DocumentStore:
             # Create new index
             self._index_documents()
 
+    def _encode_query_uncached(self, text: str) -> np.ndarray:
+        """Encode a single query; wrapped by lru_cache in __init__."""
+        embedding = self.model.encode([text], convert_to_numpy=True).astype(np.float32)
+        embedding.setflags(write=False)  # shared between callers via the cache
+        return embedding
+
+    def clear_embedding_cache(self):
+        """Drop cached query embeddings (call after the corpus changes)."""
+        self._encode_query.cache_clear()
+
+    # Above this corpus size an exact flat scan stops being cheap and an
+    # IVF index (coarse clustering + nprobe-bounded probe) pays off.
+    _IVF_THRESHOLD = 2000
+
     def _index_documents(self):
         """Embed and index documents in FAISS."""
         embeddings = self.model.encode(self.docs, convert_to_numpy=True)
         embeddings = embeddings.astype(np.float32)
 
-        # Create FAISS index (flat L2 index for exact search)
         dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dimension)
-        self.index.add(embeddings.astype(np.float32))
+        if len(self.docs) > self._IVF_THRESHOLD:
+            # Large corpus: IVF index scans ~nprobe/nlist of the vectors
+            # per query instead of all of them
+            nlist = min(100, max(1, len(self.docs) // 39))
+            quantizer = faiss.IndexFlatL2(dimension)
+            self.index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+            self.index.train(embeddings)
+            self.index.nprobe = 10
+        else:
+            # Small corpus: flat L2 index for exact search
+            self.index = faiss.IndexFlatL2(dimension)
+        self.index.add(embeddings)
 
         # Save index and docs
         os.makedirs(self.db_path, exist_ok=True)
@@ -66,10 +94,26 @@ class DocumentStore:
         parts = [p.strip() for p in raw.split("\n\n") if p.strip()]
         return cls(parts, db_path=db_path)
 
+    @classmethod
+    def load(cls, db_path: str = "./faiss_db"):
+        """
+        Load a store from a previously persisted FAISS DB, without the
+        source document file.
+
+        Raises FileNotFoundError if no persisted index exists at db_path.
+        """
+        index_path = os.path.join(db_path, "index.faiss")
+        docs_path = os.path.join(db_path, "docs.pkl")
+        if not (os.path.exists(index_path) and os.path.exists(docs_path)):
+            raise FileNotFoundError(f"No persisted FAISS DB at {db_path}")
+        # __init__ finds the persisted files and loads them instead of
+        # re-embedding; the docs list passed here is only a placeholder
+        return cls(docs=[], db_path=db_path)
+
     def retrieve(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
         """Retrieve top-k most similar documents using vector similarity."""
-        # Encode query
-        query_embedding = self.model.encode([query], convert_to_numpy=True).astype(np.float32)
+        # Encode query (cached for repeated queries)
+        query_embedding = self._encode_query(query)
 
         # Search in FAISS (returns distances)
         distances, indices = self.index.search(query_embedding, k)
@@ -81,6 +125,17 @@ class DocumentStore:
 
         return list(zip(indices[0].tolist(), scores))
 
+    def retrieve_batch(self, queries: List[str], k: int = 3) -> List[List[Tuple[int, float]]]:
+        """Retrieve top-k documents for a batch of queries in one FAISS search."""
+        # One batched encode + one index search instead of per-query calls
+        embeddings = self.model.encode(queries, convert_to_numpy=True).astype(np.float32)
+        distances, indices = self.index.search(embeddings, k)
+
+        return [
+            [(int(i), float(np.exp(-d))) for i, d in zip(idx_row, dist_row)]
+            for idx_row, dist_row in zip(indices, distances)
+        ]
+
 
 def guard_rails(text: str) -> str:
     # redact emails
@@ -312,6 +367,54 @@ Today's Hours:
         meta = f"\n\n(Retrieval latency: {elapsed:.3f}s, top={k})"
         return answer_text + meta
 
+    def answer_batch(
+        self,
+        queries: List[str],
+        k: int = 3,
+        use_llm: bool | None = None
+    ) -> List[str]:
+        """
+        Answer a batch of queries with one batched embedding + FAISS search.
+
+        The non-LLM path embeds all queries in a single model.encode call and
+        runs one index search, which is far faster than per-query retrieval.
+        The LLM path falls back to per-query answer() since each generation
+        is a separate API call anyway.
+
+        Args:
+            queries: User queries
+            k: Number of documents to retrieve per query
+            use_llm: Whether to use LLM (defaults to bot setting)
+
+        Returns:
+            List of answer texts, one per query
+        """
+        if use_llm is None:
+            use_llm = self.use_llm
+
+        if use_llm:
+            return [self.answer(q, k=k, use_llm=True) for q in queries]
+
+        start = time.time()
+        batch_hits = self.store.retrieve_batch(queries, k=k)
+        elapsed = time.time() - start
+
+        # Dynamic context is query-independent; fetch it once per batch
+        dynamic_context = self._get_dynamic_context() if self.include_dynamic else ""
+
+        answers = []
+        for hits in batch_hits:
+            pieces = [self.store.docs[i] + f"\n[similarity={score:.3f}]" for i, score in hits]
+            answer_text = "\n---\n".join(pieces)
+
+            if dynamic_context:
+                answer_text += f"\n---\n{dynamic_context}"
+
+            answer_text = guard_rails(answer_text)
+            answers.append(answer_text + f"\n\n(Retrieval latency: {elapsed:.3f}s, top={k})")
+
+        return answers
+
     def answer_with_evaluation(
         self,
         query: str,
@@ -116,7 +116,10 @@ class AdminAgent:
             Returns:
                 Summary of processed responses
             """
-            return agent._process_responses_impl()
+            processed = agent._process_responses_impl()
+            if not processed:
+                return "No new responses to process."
+            return f"Processed {processed} response(s)."
 
         @tool
         def get_pending_requests() -> List[Dict]:
@@ -257,19 +260,22 @@ class AdminAgent:
             "response_time": request.response_time
         }
 
-    def process_responses(self) -> None:
+    def process_responses(self) -> bool:
         """
         Poll for admin responses and update request statuses.
         Should be called periodically (or in a background thread).
+
+        Returns:
+            True if any new responses were processed
         """
-        self._process_responses_impl()
+        return self._process_responses_impl() > 0
 
-    def _process_responses_impl(self) -> str:
-        """Internal implementation of response processing."""
+    def _process_responses_impl(self) -> int:
+        """Internal implementation of response processing. Returns count processed."""
         responses = self.approval_channel.get_responses()
 
         if not responses:
-            return "No new responses to process."
+            return 0
 
         processed = 0
         for response in responses:
@@ -285,7 +291,7 @@ class AdminAgent:
                 self.db.save_request(request)
                 processed += 1
 
-        return f"Processed {processed} response(s)."
+        return processed
 
     def get_pending_requests(self) -> List[Dict]:
         """Get all pending requests for admin dashboard."""
@@ -5,13 +5,9 @@ Combines RAG chatbot from Stage 1 with LangChain AdminAgent from Stage 2,
 creating a complete workflow for parking reservations.
 """
 
-import os
-import sys
 import time
 from typing import Optional
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.stage1.rag_chatbot import DocumentStore, SimpleRAGChatbot, collect_reservation_interactive
 from src.stage2.admin_agent import AdminAgent, create_admin_agent
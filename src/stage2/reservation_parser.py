@@ -18,6 +18,34 @@ MONTHS = {
     'september': '09', 'october': '10', 'november': '11', 'december': '12'
 }
 
+# Unified date pattern - one alternation with named groups so a single scan
+# identifies which of the four supported formats matched:
+#   ru_full:  "с 20 марта 2026 по 21 апреля 2027"
+#   ru_short: "с 5 по 12 июля 2026" (same month)
+#   en_full:  "from 20 march 2026 to 21 april 2027"
+#   en_short: "from 5 march to 12 march 2026" (same month)
+_DATE_RE = re.compile(
+    r'с\s+(?P<rf_d1>\d+)\s+(?P<rf_m1>\S+)\s+(?P<rf_y1>\d{4})\s+по\s+(?P<rf_d2>\d+)\s+(?P<rf_m2>\S+)\s+(?P<rf_y2>\d{4})'
+    r'|с\s+(?P<rs_d1>\d+)\s+по\s+(?P<rs_d2>\d+)\s+(?P<rs_m>\S+)\s+(?P<rs_y>\d{4})'
+    r'|from\s+(?P<ef_d1>\d+)\s+(?P<ef_m1>\S+)\s+(?P<ef_y1>\d{4})\s+to\s+(?P<ef_d2>\d+)\s+(?P<ef_m2>\S+)\s+(?P<ef_y2>\d{4})'
+    r'|from\s+(?P<es_d1>\d+)\s+(?P<es_m1>\S+)\s+to\s+(?P<es_d2>\d+)\s+(?P<es_m2>\S+)\s+(?P<es_y>\d{4})'
+)
+
+# Day strings pre-padded once so the per-parse path is a dict lookup
+# instead of a str.zfill call; unparseable days fall back to zfill.
+_DAYS = {str(d): f"{d:02d}" for d in range(1, 32)}
+
+
+def _iso_date(year: str, month_str: str, day: str) -> str:
+    """Build 'YYYY-MM-DD' from regex captures (month name, unpadded day)."""
+    return f"{year}-{MONTHS.get(month_str, '02')}-{_DAYS.get(day) or day.zfill(2)}"
+
+
+_NAME_RE = re.compile(
+    r'reserve\s+(\S+)\s+(\S+)\s+([A-Za-z0-9\-]+)',
+    re.IGNORECASE | re.UNICODE
+)
+
 
 def parse_reservation(user_message: str) -> Optional[Dict[str, str]]:
     """
@@ -38,11 +66,12 @@ def parse_reservation(user_message: str) -> Optional[Dict[str, str]]:
 
     reservation_text = user_message[8:].strip()  # Remove "reserve "
 
-    # Check if has dates
+    # Check if has dates (lowercase once, reuse for the date scan below)
+    reservation_lower = reservation_text.lower()
     has_dates = (
-        " с " in reservation_text.lower() or
-        " from " in reservation_text.lower() or
-        " от " in reservation_text.lower()
+        " с " in reservation_lower or
+        " from " in reservation_lower or
+        " от " in reservation_lower
     )
 
     if not has_dates:
@@ -50,55 +79,34 @@ def parse_reservation(user_message: str) -> Optional[Dict[str, str]]:
 
     # Try to parse dates and extract details
     name, surname, car_number = None, None, None
-    start_date, end_date = None, None
-
-    # Format 1 - Russian FULL: "с 20 марта 2026 по 21 апреля 2027"
-    m = re.search(r'с\s+(\d+)\s+(\S+)\s+(\d{4})\s+по\s+(\d+)\s+(\S+)\s+(\d{4})', reservation_text.lower())
-    if m:
-        d1, m1_str, y1, d2, m2_str, y2 = m.groups()
-        m1_num = MONTHS.get(m1_str, '02')
-        m2_num = MONTHS.get(m2_str, '02')
-        start_date = f"{y1}-{m1_num}-{d1.zfill(2)}"
-        end_date = f"{y2}-{m2_num}-{d2.zfill(2)}"
-
-    # Format 2 - Russian SHORT: "с 5 по 12 июля 2026" (same month)
-    if not start_date:
-        m = re.search(r'с\s+(\d+)\s+по\s+(\d+)\s+(\S+)\s+(\d{4})', reservation_text.lower())
-        if m:
-            d1, d2, month_str, year = m.groups()
-            month_num = MONTHS.get(month_str, '02')
-            start_date = f"{year}-{month_num}-{d1.zfill(2)}"
-            end_date = f"{year}-{month_num}-{d2.zfill(2)}"
-
-    # Format 3 - English FULL: "from 20 march 2026 to 21 april 2027"
-    if not start_date:
-        m = re.search(r'from\s+(\d+)\s+(\S+)\s+(\d{4})\s+to\s+(\d+)\s+(\S+)\s+(\d{4})', reservation_text.lower())
-        if m:
-            d1, m1_str, y1, d2, m2_str, y2 = m.groups()
-            m1_num = MONTHS.get(m1_str, '02')
-            m2_num = MONTHS.get(m2_str, '02')
-            start_date = f"{y1}-{m1_num}-{d1.zfill(2)}"
-            end_date = f"{y2}-{m2_num}-{d2.zfill(2)}"
-
-    # Format 4 - English SHORT: "from 5 march to 12 march 2026" (same month)
-    if not start_date:
-        m = re.search(r'from\s+(\d+)\s+(\S+)\s+to\s+(\d+)\s+(\S+)\s+(\d{4})', reservation_text.lower())
-        if m:
-            d1, m1_str, d2, m2_str, year = m.groups()
-            m1_num = MONTHS.get(m1_str, '02')
-            m2_num = MONTHS.get(m2_str, '02')
-            start_date = f"{year}-{m1_num}-{d1.zfill(2)}"
-            end_date = f"{year}-{m2_num}-{d2.zfill(2)}"
-
-    if not start_date:
+
+    m = _DATE_RE.search(reservation_lower)
+    if not m:
         return None  # Could not parse dates
 
+    if m.group('rf_d1') is not None:
+        # Russian FULL: "с 20 марта 2026 по 21 апреля 2027"
+        d1, m1_str, y1, d2, m2_str, y2 = m.group('rf_d1', 'rf_m1', 'rf_y1', 'rf_d2', 'rf_m2', 'rf_y2')
+        start_date = _iso_date(y1, m1_str, d1)
+        end_date = _iso_date(y2, m2_str, d2)
+    elif m.group('rs_d1') is not None:
+        # Russian SHORT: "с 5 по 12 июля 2026" (same month)
+        d1, d2, month_str, year = m.group('rs_d1', 'rs_d2', 'rs_m', 'rs_y')
+        start_date = _iso_date(year, month_str, d1)
+        end_date = _iso_date(year, month_str, d2)
+    elif m.group('ef_d1') is not None:
+        # English FULL: "from 20 march 2026 to 21 april 2027"
+        d1, m1_str, y1, d2, m2_str, y2 = m.group('ef_d1', 'ef_m1', 'ef_y1', 'ef_d2', 'ef_m2', 'ef_y2')
+        start_date = _iso_date(y1, m1_str, d1)
+        end_date = _iso_date(y2, m2_str, d2)
+    else:
+        # English SHORT: "from 5 march to 12 march 2026" (same month)
+        d1, m1_str, d2, m2_str, year = m.group('es_d1', 'es_m1', 'es_d2', 'es_m2', 'es_y')
+        start_date = _iso_date(year, m1_str, d1)
+        end_date = _iso_date(year, m2_str, d2)
+
     # Extract name, surname, car
-    name_match = re.search(
-        r'reserve\s+(\S+)\s+(\S+)\s+([A-Za-z0-9\-]+)',
-        user_message,
-        re.IGNORECASE | re.UNICODE
-    )
+    name_match = _NAME_RE.search(user_message)
 
     if name_match:
         name = name_match.group(1).capitalize()
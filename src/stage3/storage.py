@@ -5,7 +5,10 @@ Minimal implementation: just save approved reservations to SQLite.
 No FastAPI, no over-engineering. Keep it simple.
 """
 
+import os
 import sqlite3
+import threading
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -14,18 +17,88 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class Reservation:
+    """
+    Immutable approved-reservation record.
+
+    Cheaper to copy-with-changes (dataclasses.replace) than a dict, and
+    frozen so fixtures and cached rows cannot be mutated in place. save()
+    and save_many() accept these interchangeably with plain dicts.
+    """
+    reservation_id: str
+    user_name: str
+    car_number: str
+    start_date: str
+    end_date: str
+    approval_time: Optional[str] = None
+
+
+def _as_row_dict(reservation: Any) -> Dict[str, Any]:
+    """Coerce a Reservation or plain dict into the dict shape save() uses."""
+    if is_dataclass(reservation):
+        return asdict(reservation)
+    return reservation
+
+
 class ReservationStorage:
     """Simple SQLite storage for approved reservations."""
 
-    def __init__(self, db_path: str = "data/reservations.db"):
-        """Initialize storage."""
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize storage.
+
+        db_path may be a filesystem path or a SQLite URI (file:...), e.g.
+        "file:name?mode=memory&cache=shared" for an in-memory database
+        shared across the short-lived connections this class opens. When
+        omitted, the RESERVATIONS_DB_PATH environment variable (set e.g.
+        per pytest-xdist worker, so parallel workers never contend on one
+        writer-serialized file) is used, then the data/ default.
+        """
+        if db_path is None:
+            db_path = os.environ.get("RESERVATIONS_DB_PATH", "data/reservations.db")
+        self._uri = isinstance(db_path, str) and db_path.startswith("file:")
+        if self._uri:
+            self.db_path = db_path
+        else:
+            self.db_path = Path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Read cache keyed by query shape, cleared on any write. Coarse
+        # table-level invalidation is plenty for this schema and lets
+        # repeated dashboard/status reads skip SQLite entirely.
+        self._cache: Dict[tuple, Any] = {}
+        # One long-lived connection reused by every operation: opening a
+        # connection per call re-reads the database header and defeats
+        # sqlite3's per-connection prepared-statement cache. The lock
+        # serializes cross-thread use (check_same_thread=False is needed
+        # for the background save executor in stage 4).
+        self._conn = sqlite3.connect(self.db_path, uri=self._uri, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # With WAL (set once in _init_db) this skips the fsync-per-commit
+        # of the FULL default while staying durable against app crashes
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn_lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open an extra connection (diagnostics/tests); ops share self._conn."""
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self) -> None:
+        """Close the long-lived connection."""
+        self._conn.close()
+
     def _init_db(self):
         """Create table if not exists."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn_lock:
+            conn = self._conn
+            # WAL is persistent in the database file: writers append to a
+            # log instead of rewriting pages under a rollback journal, so
+            # each save() commit is no longer disk-seek-bound. In-memory
+            # databases silently keep their "memory" journal mode.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS reservations (
                     id TEXT PRIMARY KEY,
@@ -37,13 +110,23 @@ class ReservationStorage:
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Date-range and per-user lookups are the prod query patterns;
+            # without these SQLite scans the whole table (id is already
+            # indexed as the primary key)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_reservations_start_date ON reservations(start_date)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_reservations_user_name ON reservations(user_name)"
+            )
             conn.commit()
 
-    def save(self, reservation: Dict[str, Any]) -> bool:
-        """Save approved reservation to database."""
+    def save(self, reservation: Any) -> bool:
+        """Save approved reservation (dict or Reservation) to database."""
+        reservation = _as_row_dict(reservation)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._conn_lock:
+                self._conn.execute("""
                     INSERT OR REPLACE INTO reservations
                     (id, user_name, car_number, start_date, end_date, approved_at)
                     VALUES (?, ?, ?, ?, ?, ?)
@@ -53,37 +136,81 @@ class ReservationStorage:
                     reservation.get('car_number'),
                     reservation.get('start_date'),
                     reservation.get('end_date'),
-                    reservation.get('approval_time', datetime.now().isoformat()),
+                    reservation.get('approval_time') or datetime.now().isoformat(),
                 ))
-                conn.commit()
+                self._conn.commit()
+            self._cache.clear()
             logger.info(f"✅ Saved: {reservation.get('reservation_id')}")
             return True
         except Exception as e:
             logger.error(f"❌ Error saving reservation: {e}")
             return False
 
+    def save_many(self, reservations: List[Any]) -> bool:
+        """
+        Save several approved reservations (dicts or Reservations) in one
+        transaction.
+
+        One prepared statement (executemany) and one commit - N individual
+        save() calls pay N journal round-trips for the same rows.
+        """
+        try:
+            with self._conn_lock:
+                self._conn.executemany("""
+                    INSERT OR REPLACE INTO reservations
+                    (id, user_name, car_number, start_date, end_date, approved_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        r.get('reservation_id'),
+                        r.get('user_name'),
+                        r.get('car_number'),
+                        r.get('start_date'),
+                        r.get('end_date'),
+                        r.get('approval_time') or datetime.now().isoformat(),
+                    )
+                    for r in map(_as_row_dict, reservations)
+                ])
+                self._conn.commit()
+            self._cache.clear()
+            logger.info(f"✅ Saved {len(reservations)} reservations")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error saving reservations: {e}")
+            return False
+
     def get_all(self) -> List[Dict[str, str]]:
         """Get all approved reservations."""
+        cached = self._cache.get(("all",))
+        if cached is not None:
+            return list(cached)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                rows = conn.execute(
+            with self._conn_lock:
+                rows = self._conn.execute(
                     "SELECT * FROM reservations ORDER BY created_at DESC"
                 ).fetchall()
-                return [dict(row) for row in rows]
+                result = [dict(row) for row in rows]
+                self._cache[("all",)] = result
+                return list(result)
         except Exception as e:
             logger.error(f"Error fetching reservations: {e}")
             return []
 
     def get_by_id(self, res_id: str) -> Optional[Dict[str, str]]:
         """Get specific reservation."""
+        cached = self._cache.get(("id", res_id))
+        if cached is not None:
+            return dict(cached)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                row = conn.execute(
+            with self._conn_lock:
+                row = self._conn.execute(
                     "SELECT * FROM reservations WHERE id = ?", (res_id,)
                 ).fetchone()
-                return dict(row) if row else None
+                if row is None:
+                    return None
+                result = dict(row)
+                self._cache[("id", res_id)] = result
+                return dict(result)
         except Exception as e:
             logger.error(f"Error fetching reservation: {e}")
             return None
@@ -0,0 +1,39 @@
+"""
+Async helpers for Stage 4 orchestration.
+
+The stage1-3 stack underneath the graph is synchronous (sqlite3, requests,
+sentence-transformers, time.sleep in the simulated approval channel).
+Async callers must keep those calls off the event loop; these helpers are
+the one pattern to use for that.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List
+
+
+async def await_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking callable in a worker thread and await its result.
+
+    Use this from async code for anything that touches sqlite, the
+    Telegram HTTP API, or the embedding model, so one slow call does not
+    stall every other in-flight request on the loop.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def bounded_gather(coros: Iterable[Awaitable[Any]], n: int = 8) -> List[Any]:
+    """
+    Gather awaitables with at most n in flight.
+
+    Unbounded asyncio.gather over LLM/Telegram calls invites 429
+    rate-limit responses, which cost more than the lost parallelism; the
+    semaphore caps concurrency while keeping results in input order.
+    """
+    sem = asyncio.Semaphore(n)
+
+    async def _run(coro: Awaitable[Any]) -> Any:
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros))
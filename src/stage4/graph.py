@@ -9,22 +9,167 @@ parking reservation workflow orchestration. Combines:
 """
 
 from typing import Literal, Optional, TypedDict, List, Any, Dict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import uuid
+from dataclasses import dataclass
+from functools import lru_cache, partial
+import logging
+import re
+import threading
+import time
 import os
-import sys
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import numpy as np
+
 
 from langgraph.graph import StateGraph, START, END
 
 from src.stage1.rag_chatbot import DocumentStore, SimpleRAGChatbot
 from src.stage2.chatbot_with_approval import Stage2Chatbot
 from src.stage2.admin_agent import AdminAgent
+from src.stage2.approval_channels import TelegramApprovalChannel
+from src.stage2.reservation_parser import parse_reservation
 from src.stage3.storage import ReservationStorage
 
 
+# Precompiled patterns shared by the router and status check nodes.
+# Compiling once at module level avoids per-call regex cache lookups
+# on the hot per-message path.
+logger = logging.getLogger(__name__)
+
+_REQ_ID_RE = re.compile(r'(REQ-\d{14}-\d{3})')
+
+# Router keyword sets compiled into single alternation patterns so each
+# message is scanned once per category instead of once per keyword.
+_STATUS_KEYWORDS = ("status", "check", "pending", "approved", "rejected", "статус", "проверь", "проверка")
+_RESERVE_KEYWORDS = ("reserve", "book", "reservation", "зарезервировать", "бронь", "резерв")
+_STATUS_KW_RE = re.compile("|".join(map(re.escape, _STATUS_KEYWORDS)))
+_RESERVE_KW_RE = re.compile("|".join(map(re.escape, _RESERVE_KEYWORDS)))
+
+# Frozenset variants for whole-word membership: tokenizing once and probing
+# the set is O(tokens), so most messages classify without a regex scan. The
+# alternation regexes remain as a fallback to keep substring matches
+# (e.g. "checking", "бронью") behaving as before.
+_STATUS_KWS = frozenset(_STATUS_KEYWORDS)
+_RESERVE_KWS = frozenset(_RESERVE_KEYWORDS)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ID generation: a cached per-second timestamp plus a process-local counter
+# per prefix. Cheaper than strftime + uuid4 per request (no format-string
+# parsing, no os.urandom syscall); IDs are unique within the process, which
+# is all the workflow needs.
+_id_lock = threading.Lock()
+_id_states: Dict[str, dict] = {}  # prefix -> {"sec", "stamp", "counter"}
+
+
+def _make_id(prefix: str, counter_fmt: str = "06X", max_counter: Optional[int] = None) -> str:
+    """
+    Generate a process-unique ID like '<prefix>-<YYYYmmddHHMMSS>-<counter>'.
+
+    Each prefix keeps its own counter (reset every second). max_counter
+    wraps the counter so it never exceeds the width the ID format allows
+    (e.g. 999 for the 3-digit REQ suffix matched by _REQ_ID_RE).
+    """
+    with _id_lock:
+        state = _id_states.setdefault(prefix, {"sec": -1, "stamp": "", "counter": 0})
+        now = int(time.time())
+        if now != state["sec"]:
+            state["sec"] = now
+            state["stamp"] = time.strftime("%Y%m%d%H%M%S")
+            state["counter"] = 0
+        state["counter"] += 1
+        counter = state["counter"]
+        if max_counter is not None:
+            counter = (counter - 1) % max_counter + 1
+        return f"{prefix}-{state['stamp']}-{counter:{counter_fmt}}"
+
+
+# Visited-node tracking: each node has a bit so "was node X visited?"
+# becomes a constant-time mask test instead of a list scan. state_history
+# (the ordered list) is kept for callers and tests that rely on order.
+# The graph visits at most 8 distinct nodes, so the visit history is a
+# bounded deque: appends never trigger a list realloc and a runaway
+# routing loop cannot grow the state. Output paths convert to list().
+_HISTORY_MAXLEN = 16
+
+_NODE_BITS = {
+    "initialize": 1 << 0,
+    "router": 1 << 1,
+    "rag": 1 << 2,
+    "status_check": 1 << 3,
+    "collection": 1 << 4,
+    "approval": 1 << 5,
+    "storage": 1 << 6,
+    "response": 1 << 7,
+}
+
+
+# Telegram drain coalescing: status checks arriving within this window
+# share one channel poll (see node_status_check) rather than each paying
+# the full drain loop.
+_DRAIN_WINDOW_SEC = 0.05
+_drain_lock = threading.Lock()
+_last_drain = {"at": 0.0}
+
+
+# Approved reservations are persisted off the response path: a single
+# worker keeps writes ordered while the workflow answers the user without
+# waiting on SQLite. ReservationStorage serializes access to its shared
+# connection internally, so cross-thread use is safe.
+_storage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-save")
+
+
+def _save_reservation(storage: "ReservationStorage", reservation: dict) -> None:
+    """Background write; save() logs its own errors and returns False."""
+    if not storage.save(reservation):
+        logger.error(
+            "Background save failed for %s", reservation.get("reservation_id")
+        )
+
+
+# Shared empty-dict sentinel for .get() fallbacks on optional state keys.
+# Treated as immutable by convention; avoids allocating a throwaway {} on
+# every miss in the hot per-message paths.
+_EMPTY: dict = {}
+
+
+def _mark_visited(state: "WorkflowState", node: str) -> None:
+    """Record a node visit in both the bitmask and the ordered history."""
+    state["visited_mask"] = state.get("visited_mask", 0) | _NODE_BITS[node]
+    state["state_history"].append(node)
+
+
+def history_nodes(mask: int) -> List[str]:
+    """Decode a visited_mask into node names (graph order, for debugging/tests)."""
+    return [name for name, bit in _NODE_BITS.items() if mask & bit]
+
+
+@lru_cache(maxsize=4096)
+def _classify(message: str) -> tuple:
+    """
+    Classify a normalized (lowercased, stripped) message.
+
+    Returns (request_type, request_id_lookup). Pure function of its input,
+    so repeated messages hit the memo instead of re-scanning keywords.
+    """
+    tokens = frozenset(_TOKEN_RE.findall(message))
+
+    # 1. Check for status_check FIRST
+    if not tokens.isdisjoint(_STATUS_KWS) or _STATUS_KW_RE.search(message):
+        # Try to extract request ID from message (e.g., "REQ-20260225225539-001")
+        match = _REQ_ID_RE.search(message)
+        return "status_check", match.group(1) if match else None
+
+    # 2. Check for RESERVATION keywords
+    if not tokens.isdisjoint(_RESERVE_KWS) or _RESERVE_KW_RE.search(message):
+        return "reservation", None
+
+    # 3. DEFAULT: Everything else is INFO (any question or information request)
+    return "info", None
+
+
 # ============================================================================
 # STATE SCHEMA - Typed state for the workflow
 # ============================================================================
@@ -94,481 +239,742 @@ class WorkflowState(TypedDict, total=False):
 
     # Metadata & error handling
     request_id: str  # Unique workflow ID
+    message_lower: str  # Normalized (lowercased, stripped) user message
     errors: List[str]  # Any errors encountered
-    state_history: List[str]  # Track which nodes were visited
+    state_history: List[str]  # Track which nodes were visited (ordered)
+    visited_mask: int  # Bitmask of visited nodes (see _NODE_BITS)
 
 
 # ============================================================================
-# GRAPH BUILDER FUNCTION
+# RAG ANSWER CACHE
 # ============================================================================
 
-def build_orchestration_graph(
-    use_llm: bool = False,
-    use_telegram: bool = False,
-    llm: Optional[Any] = None,
-) -> tuple:
+class _RAGAnswerCache:
+    """
+    Cache for RAG answers keyed by normalized query.
+
+    Two layers:
+    - Exact-match LRU: repeated literal questions become a dict lookup
+      (no embedding needed).
+    - Semantic: unit-normalized query embeddings of past answers; a new
+      query whose cosine similarity to a cached one exceeds the threshold
+      reuses the cached answer without re-running retrieval.
+
+    Entries expire after ttl_sec because answers embed the real-time
+    parking context (availability, pricing, hours) and must not be
+    served stale indefinitely.
     """
-    Build the complete LangGraph orchestration graph.
 
-    The graph has the following structure:
+    def __init__(self, maxsize: int = 512, similarity_threshold: float = 0.95, ttl_sec: float = 60.0):
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (answer, expires_at)
+        self._embeddings: Optional[np.ndarray] = None  # unit-norm rows
+        self._answers: List[str] = []
+        self._expiries: List[float] = []
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str, embedding: Optional[np.ndarray] = None) -> Optional[str]:
+        """Look up a cached answer by exact key, then by embedding similarity."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                answer, expires_at = entry
+                if now < expires_at:
+                    self._exact.move_to_end(key)
+                    self._hits += 1
+                    return answer
+                del self._exact[key]
+
+            if embedding is not None and self._answers:
+                q = embedding / (np.linalg.norm(embedding) or 1.0)
+                sims = self._embeddings @ q
+                best = int(np.argmax(sims))
+                if sims[best] >= self.similarity_threshold and now < self._expiries[best]:
+                    self._hits += 1
+                    return self._answers[best]
+
+            # node_rag probes twice (exact first, then with the embedding);
+            # count the miss only once, on the embedding-bearing probe
+            if embedding is not None:
+                self._misses += 1
+        return None
+
+    def put(self, key: str, answer: str, embedding: Optional[np.ndarray] = None) -> None:
+        """Store an answer under its normalized key and optional embedding."""
+        expires_at = time.monotonic() + self.ttl_sec
+        with self._lock:
+            self._exact[key] = (answer, expires_at)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.maxsize:
+                self._exact.popitem(last=False)
+
+            if embedding is not None:
+                q = embedding / (np.linalg.norm(embedding) or 1.0)
+                if self._embeddings is None:
+                    self._embeddings = q.reshape(1, -1)
+                else:
+                    self._embeddings = np.vstack([self._embeddings, q])[-self.maxsize:]
+                self._answers = (self._answers + [answer])[-self.maxsize:]
+                self._expiries = (self._expiries + [expires_at])[-self.maxsize:]
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss/size counters, in the spirit of lru_cache.cache_info()."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "currsize": len(self._exact),
+                "maxsize": self.maxsize,
+            }
 
-    ```
-    START
-      ↓
-    [Router Node] - Classify request type
-      ├─→ INFO REQUEST
-      │     ↓
-      │   [RAG Node] - Answer using RAG
-      │     ↓
-      │   [Response Node] - Send to user
-      │     ↓
-      │    END
-      │
-      └─→ RESERVATION REQUEST
-            ↓
-          [Collection Node] - Gather reservation details (interactive)
-            ↓
-          [Approval Node] - Submit to admin + wait for decision
-            ↓
-          [Storage Node] - Save approved reservations to DB
-            ↓
-          [Response Node] - Send outcome to user
-            ↓
-            END
-    ```
+    def clear(self) -> None:
+        """Drop all cached answers (e.g. after the document store changes)."""
+        with self._lock:
+            self._exact.clear()
+            self._embeddings = None
+            self._answers = []
+            self._expiries = []
+            self._hits = 0
+            self._misses = 0
 
-    Args:
-        use_llm: Whether to use OpenAI LLM for better answers
-        use_telegram: Whether to use Telegram for admin notifications
 
-    Returns:
-        tuple: (StateGraph, AdminAgent) - The graph and admin agent for resource cleanup
-    """
+# ============================================================================
+# SHARED RESOURCES
+# ============================================================================
 
-    # Initialize Stage 2 Chatbot (which internally uses Stage 1)
-    # This gives us both RAG and Admin functionality
-    doc_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "static_docs.txt")
-    doc_path = os.path.abspath(doc_path)
+# Building the graph itself is cheap, but loading the FAISS index, the
+# embedding model and the storage is not (seconds). Cache these resources
+# at module level so repeated graph builds (e.g. in tests) reuse them.
+_resource_lock = threading.Lock()
+_stage2_chatbots: Dict[tuple, Stage2Chatbot] = {}
+_storages: Dict[str, ReservationStorage] = {}
 
-    if os.path.exists(doc_path):
-        doc_store = DocumentStore.from_file(doc_path, db_path="./faiss_db")
-    else:
-        # Fallback to sample docs if file not found
-        sample_docs = [
-            "Parking is available 24/7",
-            "Hourly rate: $2 per hour. Daily maximum: $20",
-            "Location: 123 Main Street",
-            "Reservation process: provide name, surname, car number, period",
-        ]
-        doc_store = DocumentStore(docs=sample_docs, db_path="./faiss_db")
-
-    # Create Stage 2 Chatbot (includes Stage 1 RAG + Admin Agent)
-    stage2_chatbot = Stage2Chatbot(doc_store, use_telegram=use_telegram, use_llm=use_llm)
-    admin_agent = stage2_chatbot.admin_agent  # Get the admin agent from Stage 2
+# Common parking-info questions pre-run in the background after the
+# chatbot is built, so the embedding and answer caches are warm before
+# the first real request arrives.
+_WARMUP_QUERIES = ("parking hours", "parking location", "hourly rate", "how to reserve")
 
-    # Initialize Stage 3: Storage
-    storage = ReservationStorage()
 
-    # Create the graph
-    graph = StateGraph(WorkflowState)
+def _warm_rag(chatbot: Stage2Chatbot) -> None:
+    """Prime the retriever caches; failures here must never surface."""
+    for query in _WARMUP_QUERIES:
+        try:
+            chatbot.answer_question(query)
+        except Exception:
+            return
+
+
+def _get_stage2_chatbot(use_llm: bool, use_telegram: bool) -> Stage2Chatbot:
+    """Get (or lazily create) the shared Stage2Chatbot for this configuration."""
+    key = (use_llm, use_telegram)
+    with _resource_lock:
+        chatbot = _stage2_chatbots.get(key)
+        if chatbot is None:
+            doc_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "static_docs.txt")
+            doc_path = os.path.abspath(doc_path)
+
+            if os.path.exists(doc_path):
+                doc_store = DocumentStore.from_file(doc_path, db_path="./faiss_db")
+            else:
+                # Fallback to sample docs if file not found
+                sample_docs = [
+                    "Parking is available 24/7",
+                    "Hourly rate: $2 per hour. Daily maximum: $20",
+                    "Location: 123 Main Street",
+                    "Reservation process: provide name, surname, car number, period",
+                ]
+                doc_store = DocumentStore(docs=sample_docs, db_path="./faiss_db")
 
-    # ========================================================================
-    # NODE DEFINITIONS
-    # ========================================================================
+            chatbot = Stage2Chatbot(doc_store, use_telegram=use_telegram, use_llm=use_llm)
+            _stage2_chatbots[key] = chatbot
 
-    def node_initialize(state: WorkflowState) -> WorkflowState:
-        """Initialize workflow state with default values"""
-        if "request_id" not in state or not state["request_id"]:
-            state["request_id"] = f"FLOW-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}"
-        if "errors" not in state:
-            state["errors"] = []
-        if "state_history" not in state:
-            state["state_history"] = []
+            # Warm the retriever off the build path; the graph is usable
+            # immediately and first-request latency drops once this lands
+            if not use_llm:  # LLM warm-up would burn real API calls
+                threading.Thread(target=_warm_rag, args=(chatbot,), daemon=True).start()
+        return chatbot
 
-        state["state_history"].append("initialize")
-        return state
 
+def _get_storage(db_path: Optional[str] = None) -> ReservationStorage:
+    """Get (or lazily create) the shared ReservationStorage for this DB path."""
+    if db_path is None:
+        db_path = os.environ.get("RESERVATIONS_DB_PATH", "data/reservations.db")
+    with _resource_lock:
+        storage = _storages.get(db_path)
+        if storage is None:
+            storage = ReservationStorage(db_path)
+            _storages[db_path] = storage
+        return storage
 
-    def node_router(state: WorkflowState) -> WorkflowState:
-        """
-        Route the request based on its type.
-        Classifies user input into: info, reservation, or status_check.
 
-        Simple priority:
-        1. status_check - if contains: check, status, статус, проверь
-        2. reservation - if contains: reserve, book, бронь, резерв
-        3. info - everything else (any question/information request)
-        """
-        message = state.get("user_input", {}).get("message", "").lower().strip()
-        state["state_history"].append("router")
-
-        # 1. Check for status_check FIRST
-        if any(keyword in message for keyword in ["status", "check", "pending", "approved", "rejected", "статус", "проверь", "проверка"]):
-            state["request_type"] = "status_check"
-            # Try to extract request ID from message (e.g., "REQ-20260225225539-001")
-            import re
-            match = re.search(r'(REQ-\d{14}-\d{3})', message)
-            if match:
-                state["request_id_lookup"] = match.group(1)
+# One answer cache per graph configuration: answers depend on use_llm
+# (LLM generation vs document concatenation), so configurations must
+# never share entries.
+_rag_answer_caches: Dict[tuple, _RAGAnswerCache] = {}
 
-        # 2. Check for RESERVATION keywords
-        elif any(keyword in message for keyword in ["reserve", "book", "reservation", "зарезервировать", "бронь", "резерв"]):
-            state["request_type"] = "reservation"
 
-        # 3. DEFAULT: Everything else is INFO (any question or information request)
-        else:
-            state["request_type"] = "info"
+def _get_rag_answer_cache(use_llm: bool, use_telegram: bool) -> _RAGAnswerCache:
+    """Get (or lazily create) the answer cache for this configuration."""
+    key = (use_llm, use_telegram)
+    with _resource_lock:
+        cache = _rag_answer_caches.get(key)
+        if cache is None:
+            cache = _RAGAnswerCache()
+            _rag_answer_caches[key] = cache
+        return cache
 
-        return state
 
+@dataclass(frozen=True, slots=True)
+class Resources:
+    """Shared stage 1-3 resources passed explicitly to the graph nodes."""
+    stage2_chatbot: Stage2Chatbot
+    admin_agent: AdminAgent
+    storage: ReservationStorage
+    use_llm: bool = False
+    rag_answer_cache: Optional[_RAGAnswerCache] = None
 
-    def node_rag(state: WorkflowState) -> WorkflowState:
-        """
-        RAG Node: Answer information queries using Stage 2's RAG Chatbot (from Stage 1).
 
-        Can optionally include response quality evaluation if enabled.
-        """
-        state["state_history"].append("rag")
+# ============================================================================
+# NODE DEFINITIONS
+# ============================================================================
+# Nodes are top-level functions (not closures) so CPython's adaptive
+# interpreter can specialize them; resources are bound explicitly with
+# functools.partial when the graph is assembled.
+
+def node_initialize(state: WorkflowState) -> WorkflowState:
+    """Initialize workflow state with default values"""
+    if "request_id" not in state or not state["request_id"]:
+        state["request_id"] = _make_id("FLOW")
+    if "errors" not in state:
+        state["errors"] = []
+    history = state.get("state_history")
+    if not isinstance(history, deque):
+        # Normalize caller-supplied lists too, so invoke and invoke_batch
+        # return the same container type for the same input
+        state["state_history"] = deque(history or (), maxlen=_HISTORY_MAXLEN)
+    if "visited_mask" not in state:
+        state["visited_mask"] = 0
+
+    # Normalize the message once; downstream nodes reuse this instead of
+    # re-lowercasing the (possibly Cyrillic) string per node
+    state["message_lower"] = (state.get("user_input") or _EMPTY).get("message", "").lower().strip()
+
+    _mark_visited(state, "initialize")
+    return state
+
+
+def node_router(state: WorkflowState) -> WorkflowState:
+    """
+    Route the request based on its type.
+    Classifies user input into: info, reservation, or status_check.
 
-        try:
-            user_message = state.get("user_input", {}).get("message", "")
+    Simple priority:
+    1. status_check - if contains: check, status, статус, проверь
+    2. reservation - if contains: reserve, book, бронь, резерв
+    3. info - everything else (any question/information request)
+    """
+    message = state.get("message_lower", "")
+    _mark_visited(state, "router")
 
-            # Get RAG response from Stage 2 (which uses Stage 1)
-            answer = stage2_chatbot.answer_question(user_message)
+    request_type, request_id_lookup = _classify(message)
+    state["request_type"] = request_type
+    if request_id_lookup:
+        state["request_id_lookup"] = request_id_lookup
+
+    return state
 
-            # Optionally evaluate response quality (if evaluator available)
-            confidence = 0.8
-            evaluation_score = None
-
-            try:
-                if hasattr(stage2_chatbot, 'rag_chatbot') and hasattr(stage2_chatbot.rag_chatbot, 'evaluator'):
-                    if stage2_chatbot.rag_chatbot.evaluator:
-                        from src.stage1.response_evaluator import evaluate_response
-                        # Quick evaluation without LLM judge (too slow for real-time)
-                        evaluation = evaluate_response(
-                            query=user_message,
-                            response=answer,
-                            retrieved_hits=[],
-                            docs=[],
-                            latency=0.0,
-                            uses_llm=use_llm,
-                            ground_truth=None,
-                            use_judge=False  # Skip LLM judge for real-time performance
-                        )
-                        evaluation_score = evaluation.overall_score
-                        confidence = max(0.5, evaluation_score)
-            except Exception as e:
-                # Evaluation is optional - don't fail if it errors
-                pass
-
-            state["rag_response"] = {
-                "answer": answer,
-                "sources": [],  # Could extract from rag_chatbot if available
-                "confidence": confidence,
-                "evaluation_score": evaluation_score,
-            }
 
-            state["final_response"] = f"🤖 {answer}"
+def node_rag(state: WorkflowState, resources: Resources) -> WorkflowState:
+    """
+    RAG Node: Answer information queries using Stage 2's RAG Chatbot (from Stage 1).
 
+    Can optionally include response quality evaluation if enabled.
+    """
+    _mark_visited(state, "rag")
+    stage2_chatbot = resources.stage2_chatbot
+
+    # Only the retrieval/LLM calls below can realistically fail; keeping the
+    # try blocks tight around them leaves the plain state mutations on the
+    # specialization-friendly fast path
+    user_message = (state.get("user_input") or _EMPTY).get("message", "")
+
+    # Exact-match cache layer first: a literal repeat question must
+    # not pay an embedding call at all
+    cache = resources.rag_answer_cache
+    cache_key = state.get("message_lower", user_message.strip().lower())
+    answer = cache.get(cache_key) if cache else None
+    query_embedding = None
+
+    if answer is None and cache is not None:
+        # Exact miss - compute the embedding (lru-cached in the store)
+        # only now, for the semantic layer
+        try:
+            query_embedding = stage2_chatbot.rag_bot.store._encode_query(cache_key)[0]
+        except Exception:
+            pass  # Cache falls back to exact-match only
+        answer = cache.get(cache_key, query_embedding)
+
+    if answer is None:
+        # Get RAG response from Stage 2 (which uses Stage 1). This hits
+        # retrieval and possibly a remote LLM, so anything can go wrong here
+        try:
+            answer = stage2_chatbot.answer_question(user_message)
         except Exception as e:
             state["errors"].append(f"RAG error: {str(e)}")
             state["final_response"] = "Sorry, I couldn't retrieve information about that. Please try again."
+            return state
+        if cache is not None:
+            cache.put(cache_key, answer, query_embedding)
+
+    # Optionally evaluate response quality (if evaluator available)
+    confidence = 0.8
+    evaluation_score = None
+
+    try:
+        if hasattr(stage2_chatbot, 'rag_chatbot') and hasattr(stage2_chatbot.rag_chatbot, 'evaluator'):
+            if stage2_chatbot.rag_chatbot.evaluator:
+                from src.stage1.response_evaluator import evaluate_response
+                # Quick evaluation without LLM judge (too slow for real-time)
+                evaluation = evaluate_response(
+                    query=user_message,
+                    response=answer,
+                    retrieved_hits=[],
+                    docs=[],
+                    latency=0.0,
+                    uses_llm=resources.use_llm,
+                    ground_truth=None,
+                    use_judge=False  # Skip LLM judge for real-time performance
+                )
+                evaluation_score = evaluation.overall_score
+                confidence = max(0.5, evaluation_score)
+    except Exception:
+        # Evaluation is optional - don't fail if it errors
+        pass
 
-        return state
+    state["rag_response"] = {
+        "answer": answer,
+        "sources": [],  # Could extract from rag_chatbot if available
+        "confidence": confidence,
+        "evaluation_score": evaluation_score,
+    }
 
+    state["final_response"] = f"🤖 {answer}"
 
-    def node_status_check(state: WorkflowState) -> WorkflowState:
-        """
-        Status Check Node: Look up the status of a reservation request.
-        Delegates to Stage2Chatbot to check request status.
-        """
-        state["state_history"].append("status_check")
+    return state
 
-        try:
-            # Small delay to allow Telegram bot to process recent messages
-            import time
-            time.sleep(0.5)
-
-            # Get request ID from router's extraction or ask user
-            request_id = state.get("request_id_lookup", "")
-
-            if not request_id:
-                # If no ID extracted, try to extract from raw message
-                message = state.get("user_input", {}).get("message", "")
-                import re
-                match = re.search(r'(REQ-\d{14}-\d{3})', message)
-                if match:
-                    request_id = match.group(1)
-
-            if not request_id:
-                state["final_response"] = (
-                    "❌ I couldn't find a request ID. "
-                    "Please provide a request ID like: 'status REQ-20260225225539-001'"
-                )
-                return state
 
-            # Check status using Stage2Chatbot (which uses admin_agent internally)
-            status_info = stage2_chatbot.check_request_status(request_id)
+def node_status_check(state: WorkflowState, resources: Resources) -> WorkflowState:
+    """
+    Status Check Node: Look up the status of a reservation request.
+    Delegates to Stage2Chatbot to check request status.
+    """
+    _mark_visited(state, "status_check")
+    stage2_chatbot = resources.stage2_chatbot
+
+    try:
+        # Drain any admin responses already queued instead of sleeping a
+        # fixed 500 ms; only the Telegram channel needs settle time. The
+        # drain is coalesced: concurrent/rapid status checks within the
+        # window share one poll of the channel instead of hammering it
+        if isinstance(stage2_chatbot.admin_agent.approval_channel, TelegramApprovalChannel):
+            now = time.monotonic()
+            with _drain_lock:
+                due = now - _last_drain["at"] >= _DRAIN_WINDOW_SEC
+                if due:
+                    _last_drain["at"] = now
+            if due:
+                for _ in range(12):
+                    if not stage2_chatbot.admin_agent.process_responses():
+                        break
+                    time.sleep(0.02)
+
+        # Get request ID from router's extraction or ask user
+        request_id = state.get("request_id_lookup") or ""
+
+        if not request_id:
+            # If no ID extracted, try to extract from raw message
+            message = (state.get("user_input") or _EMPTY).get("message", "")
+            match = _REQ_ID_RE.search(message)
+            if match:
+                request_id = match.group(1)
 
-            # Format response
-            if status_info.get("status") == "not_found":
-                state["final_response"] = f"❌ Request {request_id} not found. Please check the ID and try again."
-            else:
-                status = status_info.get("status", "unknown").upper()
-                approved = status_info.get("approved", False)
-                reason = status_info.get("reason", "")
+        if not request_id:
+            state["final_response"] = (
+                "❌ I couldn't find a request ID. "
+                "Please provide a request ID like: 'status REQ-20260225225539-001'"
+            )
+            return state
 
-                response_parts = [
-                    f"📋 **Request Status: {request_id}**",
-                    f"Status: {status} {'✅' if approved else '❌'}",
-                ]
+        # Check status using Stage2Chatbot (which uses admin_agent internally)
+        status_info = stage2_chatbot.check_request_status(request_id)
 
-                if reason:
-                    response_parts.append(f"Details: {reason}")
+        # Format response
+        if status_info.get("status") == "not_found":
+            state["final_response"] = f"❌ Request {request_id} not found. Please check the ID and try again."
+        else:
+            status = status_info.get("status", "unknown").upper()
+            approved = status_info.get("approved", False)
+            reason = status_info.get("reason", "")
 
-                if status_info.get("response_time"):
-                    response_parts.append(f"Response time: {status_info['response_time']}")
+            response_parts = [
+                f"📋 **Request Status: {request_id}**",
+                f"Status: {status} {'✅' if approved else '❌'}",
+            ]
 
-                state["final_response"] = "\n".join(response_parts)
+            if reason:
+                response_parts.append(f"Details: {reason}")
 
-        except Exception as e:
-            state["errors"].append(f"Status check error: {str(e)}")
-            state["final_response"] = f"Error checking status: {str(e)}"
+            if status_info.get("response_time"):
+                response_parts.append(f"Response time: {status_info['response_time']}")
 
-        return state
+            state["final_response"] = "\n".join(response_parts)
 
+    except Exception as e:
+        state["errors"].append(f"Status check error: {str(e)}")
+        state["final_response"] = f"Error checking status: {str(e)}"
 
-    def node_collection(state: WorkflowState) -> WorkflowState:
-        """
-        Collection Node: Parse reservation details from user input.
-        Delegates to Stage2Chatbot - no duplication of parsing logic.
-        """
-        state["state_history"].append("collection")
+    return state
 
-        try:
-            user_message = state.get("user_input", {}).get("message", "").strip()
-
-            # Use Stage2's parser directly
-            from src.stage2.reservation_parser import parse_reservation
-            parsed = parse_reservation(user_message)
-
-            if not parsed:
-                # Parsing failed - set error message and return
-                state["errors"].append("Collection: Could not parse reservation")
-                state["final_response"] = (
-                    "❌ Could not parse reservation. Use format:\n"
-                    "  reserve <Name> <Surname> <Car> <Dates>\n\n"
-                    "Examples:\n"
-                    "  • reserve John Smith ABC123 from 5 march to 12 march 2026\n"
-                    "  • reserve Иван Петров RS1234 с 5 по 12 июля 2026"
-                )
-                return state
 
-            # Success - store reservation details for approval node
-            request_id = f"REQ-{datetime.now().strftime('%Y%m%d%H%M%S')}-001"
+def node_collection(state: WorkflowState) -> WorkflowState:
+    """
+    Collection Node: Parse reservation details from user input.
+    Delegates to Stage2Chatbot - no duplication of parsing logic.
+    """
+    _mark_visited(state, "collection")
+
+    user_message = (state.get("user_input") or _EMPTY).get("message", "").strip()
+
+    # Only the parse and period split can raise; wrap just those so the
+    # state assembly below stays try-free
+    try:
+        # Use Stage2's parser directly (imported at module level)
+        parsed = parse_reservation(user_message)
+        if parsed:
+            # Single pass over "start 10:00 - end 12:00": partition at the
+            # separator, then take the first word of each half
             period = parsed["period"]
-            start_date = period.split(" ")[0]
-            end_date = period.split(" - ")[1].split(" ")[0]
-
-            state["reservation_details"] = {
-                "request_id": request_id,
-                "name": parsed["name"],
-                "surname": parsed["surname"],
-                "car_number": parsed["car_number"],
-                "period": period,
-                "start_date": start_date,
-                "end_date": end_date,
+            start, _, rest = period.partition(" - ")
+            start_date = start.split(" ", 1)[0]
+            end_date = rest.split(" ", 1)[0]
+    except (ValueError, KeyError, IndexError, AttributeError) as e:
+        state["errors"].append(f"Collection error: {str(e)}")
+        state["final_response"] = f"Error: {str(e)}"
+        return state
+
+    if not parsed:
+        # Parsing failed - set error message and return
+        state["errors"].append("Collection: Could not parse reservation")
+        state["final_response"] = (
+            "❌ Could not parse reservation. Use format:\n"
+            "  reserve <Name> <Surname> <Car> <Dates>\n\n"
+            "Examples:\n"
+            "  • reserve John Smith ABC123 from 5 march to 12 march 2026\n"
+            "  • reserve Иван Петров RS1234 с 5 по 12 июля 2026"
+        )
+        return state
+
+    # Success - store reservation details for approval node
+    state["reservation_details"] = {
+        "request_id": _make_id("REQ", "03d", max_counter=999),
+        "name": parsed["name"],
+        "surname": parsed["surname"],
+        "car_number": parsed["car_number"],
+        "period": period,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+    return state
+
+
+def node_approval(state: WorkflowState, resources: Resources) -> WorkflowState:
+    """
+    Approval Node: Submit to admin and wait for approval.
+    COMPLETELY DELEGATES to Stage2Chatbot - no reimplementation.
+    This ensures Stage 4 behaves exactly like Stage 2.
+    """
+    _mark_visited(state, "approval")
+    stage2_chatbot = resources.stage2_chatbot
+
+    # One timestamp per call for the submission-side branches; the
+    # post-wait branch takes a fresh one since response_time records when
+    # the admin actually responded
+    now_iso = datetime.now().isoformat()
+
+    try:
+        details = state.get("reservation_details")
+        if not details:
+            state["errors"].append("Approval error: No valid reservation details")
+            state["approval_result"] = {
+                "status": "error",
+                "admin_feedback": "No reservation details available",
+                "response_time": now_iso,
             }
+            return state
 
-        except Exception as e:
-            state["errors"].append(f"Collection error: {str(e)}")
-            state["final_response"] = f"Error: {str(e)}"
+        # Use Stage2Chatbot methods - complete delegation, no duplication
+        result = stage2_chatbot.initiate_reservation(details)
 
-        return state
+        if not result.get("success"):
+            state["errors"].append(f"Submission failed: {result['message']}")
+            state["approval_result"] = {
+                "status": "error",
+                "admin_feedback": result['message'],
+                "response_time": now_iso,
+            }
+            return state
 
+        # Wait for approval using Stage2's exact same logic
+        request_id = result["request_id"]
+        status = stage2_chatbot.wait_for_approval(request_id, timeout_sec=2)
 
-    def node_approval(state: WorkflowState) -> WorkflowState:
-        """
-        Approval Node: Submit to admin and wait for approval.
-        COMPLETELY DELEGATES to Stage2Chatbot - no reimplementation.
-        This ensures Stage 4 behaves exactly like Stage 2.
-        """
-        state["state_history"].append("approval")
+        state["approval_result"] = {
+            "status": status.get("status", "pending"),
+            "admin_feedback": status.get("reason", ""),
+            "response_time": datetime.now().isoformat(),
+        }
 
-        try:
-            if not state.get("reservation_details"):
-                state["errors"].append("Approval error: No valid reservation details")
-                state["approval_result"] = {
-                    "status": "error",
-                    "admin_feedback": "No reservation details available",
-                    "response_time": datetime.now().isoformat(),
-                }
-                return state
+    except Exception as e:
+        state["errors"].append(f"Approval error: {str(e)}")
+        state["approval_result"] = {
+            "status": "error",
+            "admin_feedback": str(e),
+            "response_time": now_iso,
+        }
 
-            details = state.get("reservation_details", {})
+    return state
 
-            # Use Stage2Chatbot methods - complete delegation, no duplication
-            result = stage2_chatbot.initiate_reservation(details)
 
-            if not result.get("success"):
-                state["errors"].append(f"Submission failed: {result['message']}")
-                state["approval_result"] = {
-                    "status": "error",
-                    "admin_feedback": result['message'],
-                    "response_time": datetime.now().isoformat(),
-                }
-                return state
+def node_storage(state: WorkflowState, resources: Resources) -> WorkflowState:
+    """
+    Storage Node: Save approved reservations to database (Stage 3).
+    Only saves if approval status is 'approved'.
+    """
+    _mark_visited(state, "storage")
 
-            # Wait for approval using Stage2's exact same logic
-            request_id = result["request_id"]
-            status = stage2_chatbot.wait_for_approval(request_id, timeout_sec=2)
+    state["storage_success"] = False
+    state["storage_message"] = ""
 
-            state["approval_result"] = {
-                "status": status.get("status", "pending"),
-                "admin_feedback": status.get("reason", ""),
-                "response_time": datetime.now().isoformat(),
-            }
+    try:
+        approval = state.get("approval_result") or _EMPTY
+        approval_status = approval.get("status", "")
 
-        except Exception as e:
-            state["errors"].append(f"Approval error: {str(e)}")
-            state["approval_result"] = {
-                "status": "error",
-                "admin_feedback": str(e),
-                "response_time": datetime.now().isoformat(),
+        if approval_status == "approved":
+            details = state.get("reservation_details") or _EMPTY
+
+            reservation = {
+                "reservation_id": details.get("request_id", ""),
+                "user_name": f"{details.get('name', '')} {details.get('surname', '')}",
+                "car_number": details.get("car_number", ""),
+                "start_date": details.get("start_date", ""),
+                "end_date": details.get("end_date", ""),
+                "approval_time": approval.get("response_time", ""),
             }
 
-        return state
+            # Queue the write off the response path: the user-facing
+            # outcome does not depend on the fsync, so the single-worker
+            # executor (which preserves write order) absorbs the disk I/O
+            _storage_executor.submit(_save_reservation, resources.storage, reservation)
+            state["storage_success"] = True
+            state["storage_message"] = f"✅ Reservation accepted, save queued: {reservation.get('reservation_id')}"
 
+        elif approval_status == "rejected":
+            state["storage_message"] = "⚠️ Reservation was rejected by admin, not saved"
 
-    def node_storage(state: WorkflowState) -> WorkflowState:
-        """
-        Storage Node: Save approved reservations to database (Stage 3).
-        Only saves if approval status is 'approved'.
-        """
-        state["state_history"].append("storage")
+        else:
+            state["storage_message"] = "⚠️ Approval status unknown"
 
-        state["storage_success"] = False
-        state["storage_message"] = ""
+    except Exception as e:
+        state["errors"].append(f"Storage error: {str(e)}")
+        state["storage_message"] = f"❌ Storage error: {str(e)}"
 
-        try:
-            approval_status = state.get("approval_result", {}).get("status", "")
-
-            if approval_status == "approved":
-                details = state.get("reservation_details", {})
-
-                reservation = {
-                    "reservation_id": details.get("request_id", ""),
-                    "user_name": f"{details.get('name', '')} {details.get('surname', '')}",
-                    "car_number": details.get("car_number", ""),
-                    "start_date": details.get("start_date", ""),
-                    "end_date": details.get("end_date", ""),
-                    "approval_time": state.get("approval_result", {}).get("response_time", ""),
-                }
+    return state
 
-                # Save to database
-                if storage.save(reservation):
-                    state["storage_success"] = True
-                    state["storage_message"] = f"✅ Reservation saved to database: {reservation.get('reservation_id')}"
-                else:
-                    state["storage_message"] = "⚠️ Could not save to database"
 
-            elif approval_status == "rejected":
-                state["storage_message"] = "⚠️ Reservation was rejected by admin, not saved"
+# Per-type response builders, dispatched by a single dict lookup in
+# node_response instead of an if/elif chain. Info and status-check
+# responses are already set by their nodes, so those types need no entry.
 
-            else:
-                state["storage_message"] = "⚠️ Approval status unknown"
+def _respond_reservation(state: WorkflowState) -> None:
+    # Errors during collection/approval already set the response message
+    if state.get("errors"):
+        return
 
-        except Exception as e:
-            state["errors"].append(f"Storage error: {str(e)}")
-            state["storage_message"] = f"❌ Storage error: {str(e)}"
+    # Reservation submitted - will always be pending (2 sec timeout is too short)
+    request_id = (state.get("reservation_details") or _EMPTY).get("request_id", "")
+    state["final_response"] = (
+        f"✅ Reservation request submitted!\n"
+        f"Request ID: {request_id}\n"
+        f"Your request has been sent to the administrator for review.\n\n"
+        f"⏳ YOUR REQUEST IS PENDING ADMIN REVIEW\n"
+        f"   Request ID: {request_id}\n"
+        f"   Use 'status {request_id}' to check status anytime"
+    )
 
-        return state
 
+def _respond_unknown(state: WorkflowState) -> None:
+    state["final_response"] = (
+        "I didn't understand your request. Try:\n"
+        "- Ask about parking info\n"
+        "- 'reserve <Name> <Surname> <Car> <Dates>' to make a reservation"
+    )
 
-    def node_response(state: WorkflowState) -> WorkflowState:
-        """
-        Response Node: Format final response to user.
-        For reservations, response comes directly from Stage2Chatbot approval result.
-        """
-        state["state_history"].append("response")
 
-        request_type = state.get("request_type", "unknown")
+def _respond_noop(state: WorkflowState) -> None:
+    # Response already set by the RAG / status-check node
+    pass
 
-        if request_type == "info":
-            # Info response already set by RAG node
-            pass
 
-        elif request_type == "reservation":
-            # Check if there were errors during collection/approval
-            if state.get("errors"):
-                # Error message already set by collection node
-                pass
-            else:
-                # Reservation submitted - will always be pending (2 sec timeout is too short)
-                request_id = state.get("reservation_details", {}).get('request_id')
-                state["final_response"] = (
-                    f"✅ Reservation request submitted!\n"
-                    f"Request ID: {request_id}\n"
-                    f"Your request has been sent to the administrator for review.\n\n"
-                    f"⏳ YOUR REQUEST IS PENDING ADMIN REVIEW\n"
-                    f"   Request ID: {request_id}\n"
-                    f"   Use 'status {request_id}' to check status anytime"
-                )
+_RESPONSE_BUILDERS = {
+    "info": _respond_noop,
+    "reservation": _respond_reservation,
+    "status_check": _respond_noop,
+}
 
-        elif request_type == "status_check":
-            # Status check response already set by status_check node
-            pass
 
-        else:  # unknown
-            state["final_response"] = (
-                "I didn't understand your request. Try:\n"
-                "- Ask about parking info\n"
-                "- 'reserve <Name> <Surname> <Car> <Dates>' to make a reservation"
-            )
+def node_response(state: WorkflowState) -> WorkflowState:
+    """
+    Response Node: Format final response to user.
+    For reservations, response comes directly from Stage2Chatbot approval result.
+    """
+    _mark_visited(state, "response")
+    _RESPONSE_BUILDERS.get(state.get("request_type", "unknown"), _respond_unknown)(state)
+    return state
 
-        return state
 
+def route_request(state: WorkflowState) -> str:
+    """
+    Conditional routing: Choose path based on request type.
 
-    def route_request(state: WorkflowState) -> str:
-        """
-        Conditional routing: Choose path based on request type.
+    Returns: Next node name
+    """
+    request_type = state.get("request_type", "unknown")
+
+    if request_type == "info":
+        return "rag"
+    elif request_type == "reservation":
+        return "collection"
+    elif request_type == "status_check":
+        return "status_check"
+    else:
+        return "response"
 
-        Returns: Next node name
-        """
-        request_type = state.get("request_type", "unknown")
-
-        if request_type == "info":
-            return "rag"
-        elif request_type == "reservation":
-            return "collection"
-        elif request_type == "status_check":
-            return "status_check"
-        else:
-            return "response"
 
+def route_after_approval(state: WorkflowState) -> str:
+    """
+    After approval, check if we should save to storage.
 
-    def route_after_approval(state: WorkflowState) -> str:
-        """
-        After approval, check if we should save to storage.
+    Returns: Next node name
+    """
+    approval_status = (state.get("approval_result") or _EMPTY).get("status", "")
 
-        Returns: Next node name
-        """
-        approval_status = state.get("approval_result", {}).get("status", "")
+    if approval_status == "approved":
+        return "storage"
+    else:
+        return "response"
 
-        if approval_status == "approved":
-            return "storage"
-        else:
-            return "response"
 
+# ============================================================================
+# GRAPH BUILDER FUNCTION
+# ============================================================================
+
+# Built (uncompiled) graphs, memoized per configuration: the StateGraph
+# is a pure function of its arguments (heavy resources behind it are
+# already cached), so repeated builds - tests, create_orchestration_graph
+# with different checkpointers - reuse one DAG.
+_built_graph_lock = threading.Lock()
+_built_graphs: Dict[tuple, tuple] = {}
+
+
+def build_orchestration_graph(
+    use_llm: bool = False,
+    use_telegram: bool = False,
+    llm: Optional[Any] = None,
+) -> tuple:
+    """
+    Build (or reuse) the complete LangGraph orchestration graph.
+
+    The graph has the following structure:
+
+    ```
+    START
+      ↓
+    [Router Node] - Classify request type
+      ├─→ INFO REQUEST
+      │     ↓
+      │   [RAG Node] - Answer using RAG
+      │     ↓
+      │   [Response Node] - Send to user
+      │     ↓
+      │    END
+      │
+      └─→ RESERVATION REQUEST
+            ↓
+          [Collection Node] - Gather reservation details (interactive)
+            ↓
+          [Approval Node] - Submit to admin + wait for decision
+            ↓
+          [Storage Node] - Save approved reservations to DB
+            ↓
+          [Response Node] - Send outcome to user
+            ↓
+            END
+    ```
 
-    # Add nodes to graph
+    Args:
+        use_llm: Whether to use OpenAI LLM for better answers
+        use_telegram: Whether to use Telegram for admin notifications
+
+    Returns:
+        tuple: (StateGraph, AdminAgent) - The graph and admin agent for resource cleanup
+    """
+    key = (use_llm, use_telegram, id(llm) if llm is not None else None)
+    with _built_graph_lock:
+        cached = _built_graphs.get(key)
+        if cached is None:
+            cached = _build_orchestration_graph(use_llm, use_telegram, llm)
+            _built_graphs[key] = cached
+        return cached
+
+
+def _build_orchestration_graph(
+    use_llm: bool,
+    use_telegram: bool,
+    llm: Optional[Any],
+) -> tuple:
+    """Uncached graph construction; see build_orchestration_graph."""
+
+    # Shared Stage 2 Chatbot (includes Stage 1 RAG + Admin Agent) and
+    # Stage 3 storage - reused across graph builds, see SHARED RESOURCES above
+    stage2_chatbot = _get_stage2_chatbot(use_llm=use_llm, use_telegram=use_telegram)
+    admin_agent = stage2_chatbot.admin_agent  # Get the admin agent from Stage 2
+    storage = _get_storage()
+
+    resources = Resources(
+        stage2_chatbot=stage2_chatbot,
+        admin_agent=admin_agent,
+        storage=storage,
+        use_llm=use_llm,
+        rag_answer_cache=_get_rag_answer_cache(use_llm, use_telegram),
+    )
+
+    # Create the graph
+    graph = StateGraph(WorkflowState)
+
+    # Add nodes to graph (resource-dependent nodes get them bound via partial)
     graph.add_node("initialize", node_initialize)
     graph.add_node("router", node_router)
-    graph.add_node("rag", node_rag)
-    graph.add_node("status_check", node_status_check)
+    graph.add_node("rag", partial(node_rag, resources=resources))
+    graph.add_node("status_check", partial(node_status_check, resources=resources))
     graph.add_node("collection", node_collection)
-    graph.add_node("approval", node_approval)
-    graph.add_node("storage", node_storage)
+    graph.add_node("approval", partial(node_approval, resources=resources))
+    graph.add_node("storage", partial(node_storage, resources=resources))
     graph.add_node("response", node_response)
 
     # Add edges
@@ -618,43 +1024,146 @@ def build_orchestration_graph(
 class GraphWithResources:
     """Wrapper for compiled graph that also stores resource references."""
 
-    def __init__(self, compiled_graph: Any, admin_agent: Any = None):
+    def __init__(self, compiled_graph: Any, admin_agent: Any = None, resources: Optional[Resources] = None):
         self.compiled_graph = compiled_graph
         self._admin_agent = admin_agent
+        self._resources = resources
+        # Bind the hot pass-through methods once so calls skip the
+        # __getattr__ fallback (one descriptor-protocol miss per call)
+        self.stream = compiled_graph.stream
+        self.astream = compiled_graph.astream
+        self.get_graph = compiled_graph.get_graph
+
+    def invoke(self, state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Invoke the compiled graph (config carries e.g. the thread_id
+        when a checkpointer is attached)."""
+        return self.compiled_graph.invoke(state, config)
+
+    async def ainvoke(self, state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Async invoke for concurrent callers.
+
+        LangGraph runs the sync nodes in the default executor, so while one
+        request blocks on RAG retrieval or the Telegram round-trip the event
+        loop is free to advance other in-flight requests.
+        """
+        return await self.compiled_graph.ainvoke(state, config)
 
-    def invoke(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Invoke the compiled graph."""
-        return self.compiled_graph.invoke(state)
+    def invoke_batch(self, states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process several initial states at once.
+
+        Info-type requests are answered with one batched RAG call (single
+        embedding batch + single FAISS search). Reservation and status
+        paths still go through invoke() individually - they are interactive
+        and hit external channels.
+        """
+        if self._resources is None:
+            return [self.invoke(state) for state in states]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(states)
+        info_batch = []  # (index, pre-routed state)
+
+        for i, state in enumerate(states):
+            # Fresh copy with its own list fields: dict(state) alone would
+            # share errors/state_history, so the probe would mutate the
+            # caller's state and pre-visit nodes that invoke() re-runs
+            probe = dict(state)
+            probe["errors"] = list(state.get("errors") or [])
+            probe["state_history"] = deque(state.get("state_history") or (), maxlen=_HISTORY_MAXLEN)
+            probe = node_router(node_initialize(probe))
+            if probe.get("request_type") == "info":
+                info_batch.append((i, probe))
+            else:
+                # Same isolation for the full-graph path: the nodes mutate
+                # their input in place, so invoking the caller's state
+                # directly would leak errors/state_history appends back
+                fresh = dict(state)
+                fresh["errors"] = list(state.get("errors") or [])
+                fresh["state_history"] = deque(
+                    state.get("state_history") or (), maxlen=_HISTORY_MAXLEN
+                )
+                results[i] = self.invoke(fresh)
+
+        if info_batch:
+            rag_bot = self._resources.stage2_chatbot.rag_bot
+            messages = [(s.get("user_input") or _EMPTY).get("message", "") for _, s in info_batch]
+            answers = rag_bot.answer_batch(messages)
+
+            for (i, probe), answer in zip(info_batch, answers):
+                _mark_visited(probe, "rag")
+                probe["rag_response"] = {
+                    "answer": answer,
+                    "sources": [],
+                    "confidence": 0.8,
+                    "evaluation_score": None,
+                }
+                probe["final_response"] = f"🤖 {answer}"
+                results[i] = node_response(probe)
+
+        return results
 
     def compile(self):
         """For compatibility - return self since already compiled."""
         return self
 
     def __getattr__(self, name: str):
-        """Forward other attributes to compiled graph."""
+        """Cold-path fallback: forward other attributes to compiled graph."""
         return getattr(self.compiled_graph, name)
 
 
+# Compiled graphs are identical for a given configuration, so cache them -
+# rebuilding the node/edge DAG and recompiling on every call is pure
+# dispatch overhead. The cached wrapper (and its admin_agent) is shared by
+# all callers with the same configuration.
+_compiled_graph_lock = threading.Lock()
+_compiled_graphs: Dict[tuple, GraphWithResources] = {}
+
+
 def create_orchestration_graph(
     use_llm: bool = False,
     use_telegram: bool = False,
     llm: Optional[Any] = None,
+    checkpointer: Optional[Any] = None,
 ) -> GraphWithResources:
     """
-    Create and compile the orchestration graph.
+    Create (or reuse) the compiled orchestration graph.
 
     Args:
         use_llm: Whether to use OpenAI LLM
         use_telegram: Whether to use Telegram for admin notifications
         llm: Optional LangChain LLM instance
+        checkpointer: Optional LangGraph checkpoint saver; invocations then
+            need config={"configurable": {"thread_id": ...}}
 
     Returns:
         GraphWithResources with compiled graph and admin_agent reference
     """
-    # build_orchestration_graph now returns (graph, admin_agent)
-    graph_builder, admin_agent = build_orchestration_graph(use_llm, use_telegram, llm)
-    compiled = graph_builder.compile()
+    key = (
+        use_llm,
+        use_telegram,
+        id(llm) if llm is not None else None,
+        id(checkpointer) if checkpointer is not None else None,
+    )
+
+    with _compiled_graph_lock:
+        cached = _compiled_graphs.get(key)
+        if cached is None:
+            # build_orchestration_graph now returns (graph, admin_agent)
+            graph_builder, admin_agent = build_orchestration_graph(use_llm, use_telegram, llm)
+            compiled = graph_builder.compile(checkpointer=checkpointer)
+
+            # Same shared resources the nodes were bound to (cached lookups)
+            resources = Resources(
+                stage2_chatbot=_get_stage2_chatbot(use_llm=use_llm, use_telegram=use_telegram),
+                admin_agent=admin_agent,
+                storage=_get_storage(),
+                use_llm=use_llm,
+                rag_answer_cache=_get_rag_answer_cache(use_llm, use_telegram),
+            )
 
-    # Return wrapper that contains both the compiled graph and admin_agent reference
-    return GraphWithResources(compiled, admin_agent)
+            # Wrapper that contains both the compiled graph and admin_agent reference
+            cached = GraphWithResources(compiled, admin_agent, resources)
+            _compiled_graphs[key] = cached
+        return cached
 
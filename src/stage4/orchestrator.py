@@ -5,19 +5,144 @@ Wrapper around the LangGraph for easy integration and management.
 Provides a simple interface for processing requests through the complete workflow.
 """
 
+import asyncio
+import atexit
+import hashlib
 import json
+import logging
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import os
 import sys
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import numpy as np
+
 
 # Lazy import to avoid hanging on module load
 # These will be imported when create_orchestrator() is called
 # from src.stage4.graph import create_orchestration_graph, WorkflowState, UserInput
 
+logger = logging.getLogger(__name__)
+
+# Optional drop-in Rust accelerators for LangGraph internals (executor
+# reuse, channel writes). API-compatible shim; a no-op when the package
+# is not installed.
+try:
+    import fast_langgraph
+    fast_langgraph.shim.patch_langgraph()
+except (ImportError, AttributeError):
+    pass
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Spill serializer fallback for json.dump.
+
+    state_history is a deque; bare default=str would store its repr and
+    load_full_state could no longer return it as a sequence. Containers
+    JSON does not know become lists, everything else falls back to str.
+    """
+    if isinstance(obj, (deque, set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate recursive memory footprint of a record (sys.getsizeof walk).
+
+    Entry count is a poor proxy for RSS when one record carries a full RAG
+    context and another carries none; this walks containers so the byte cap
+    below bounds actual memory.
+    """
+    if _seen is None:
+        _seen = set()
+    obj_id = id(obj)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, _seen) + _deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, _seen) for item in obj)
+    return size
+
+
+# In-memory full states are compacted before caching: FP32 embedding
+# vectors quantize to int8 (4x smaller, <1% cosine error - fine for
+# debug inspection, not recomputation) and long strings deflate with
+# zlib. Both reverse losslessly enough via _expand_state.
+_VEC_MARK = "__vec_int8__"
+_STR_MARK = "__zlib_utf8__"
+_COMPACT_MIN_STR = 512
+
+
+def _compact_state(obj: Any) -> Any:
+    """Recursively shrink a state dict for retention in request_history."""
+    if isinstance(obj, np.ndarray) and obj.dtype == np.float32:
+        scale = float(np.abs(obj).max()) or 1.0
+        quantized = np.round(obj / scale * 127).astype(np.int8)
+        return (_VEC_MARK, quantized.tobytes(), scale, obj.shape)
+    if isinstance(obj, str) and len(obj) > _COMPACT_MIN_STR:
+        return (_STR_MARK, zlib.compress(obj.encode("utf-8"), 3))
+    if isinstance(obj, dict):
+        return {k: _compact_state(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_compact_state(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_compact_state(v) for v in obj)
+    return obj
+
+
+def _expand_state(obj: Any) -> Any:
+    """Reverse _compact_state (vectors come back as approximate float32)."""
+    if isinstance(obj, tuple):
+        if len(obj) == 4 and obj[0] == _VEC_MARK:
+            _, raw, scale, shape = obj
+            vec = np.frombuffer(raw, dtype=np.int8).astype(np.float32)
+            return (vec * (scale / 127.0)).reshape(shape)
+        if len(obj) == 2 and obj[0] == _STR_MARK:
+            return zlib.decompress(obj[1]).decode("utf-8")
+        return tuple(_expand_state(v) for v in obj)
+    if isinstance(obj, dict):
+        return {k: _expand_state(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_expand_state(v) for v in obj]
+    return obj
+
+
+# Admin-agent shutdown pool: stopping the Telegram channel drains its
+# polling thread (up to ~5s). close() offloads that here so callers -
+# and test suites spawning many short-lived orchestrators - do not
+# serialize on it; the atexit hook waits for all pending closes so the
+# interpreter never exits mid-shutdown.
+_shutdown_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-close")
+_shutdown_futures: List[Future] = []
+
+
+def _close_agent(agent: Any) -> None:
+    try:
+        agent.close()
+    except Exception as e:
+        print(f"⚠️  Error closing admin agent: {e}")
+
+
+def _drain_shutdowns() -> None:
+    for future in _shutdown_futures:
+        try:
+            future.result(timeout=10)
+        except Exception:
+            pass
+
+
+atexit.register(_drain_shutdowns)
+
+
 # Import these at module level as they're lightweight
 def _get_graph_module():
     """Lazy import graph module to avoid hanging on module load."""
@@ -44,6 +169,11 @@ class LangGraphOrchestrator:
         use_telegram: bool = False,
         llm: Optional[Any] = None,
         verbose: bool = False,
+        max_history: int = 1024,
+        max_history_bytes: Optional[int] = None,
+        store_full_state: bool = False,
+        full_state_dir: Optional[str] = None,
+        checkpointer: Optional[Any] = None,
     ):
         """
         Initialize the orchestrator.
@@ -53,11 +183,24 @@ class LangGraphOrchestrator:
             use_telegram: Whether to use Telegram for admin notifications
             llm: Optional LangChain LLM instance
             verbose: Whether to print detailed workflow information
+            max_history: Cap on retained request records (LRU eviction)
+            max_history_bytes: Optional cap on the approximate total bytes
+                of retained records; evicts LRU entries until under the cap
+            store_full_state: Keep the full workflow state per record; off
+                by default because states embed retrieved docs and grow RSS
+                without bound over long sessions
+            full_state_dir: With store_full_state, spill states to JSON
+                files in this directory instead of pinning them in memory;
+                records keep only the path (load via load_full_state)
+            checkpointer: Optional LangGraph checkpoint saver (e.g.
+                MemorySaver); per-user threads then persist state across
+                invocations, keyed by user_id
         """
         self.use_llm = use_llm
         self.use_telegram = use_telegram
         self.llm = llm
         self.verbose = verbose
+        self.checkpointer = checkpointer
         self.admin_agent = None  # Store reference to admin agent for cleanup
 
         # Lazy import to avoid hanging
@@ -68,15 +211,139 @@ class LangGraphOrchestrator:
             use_llm=use_llm,
             use_telegram=use_telegram,
             llm=llm,
+            checkpointer=checkpointer,
         )
 
         # Store the graph and admin agent reference
         self.graph = graph_with_resources
         self.admin_agent = graph_with_resources._admin_agent
 
-        # Track processed requests
-        self.request_history: Dict[str, Dict[str, Any]] = {}
+        # Track processed requests: LRU-ordered and capped so a
+        # long-running session cannot grow memory without bound
+        self.request_history: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_history = max_history
+        self.max_history_bytes = max_history_bytes
+        self.store_full_state = store_full_state
+        self.full_state_dir = full_state_dir
+        if full_state_dir:
+            os.makedirs(full_state_dir, exist_ok=True)
+        self._history_bytes = 0
+        self._history_hits = 0
+        self._history_misses = 0
+
+        # Identical (user_id, message) pairs arriving while the first is
+        # still in flight share one graph invocation instead of running
+        # the LLM/RAG pipeline twice (async path only)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+
+
+    # Immutable defaults copied per request; the mutable fields
+    # (user_input, errors, state_history) are filled in fresh each call
+    _INITIAL_STATE_TEMPLATE: Dict[str, Any] = {
+        "request_type": "unknown",
+        "final_response": "",
+        "request_id": "",
+        "storage_success": False,
+        "storage_message": "",
+    }
+
+    # Scalar output keys with their defaults; _finalize_request copies
+    # them in one comprehension instead of eight .get calls, and the
+    # nested approval_result lookup avoids allocating a default {} on miss
+    _RESULT_DEFAULTS = (
+        ("final_response", ""),
+        ("request_id", ""),
+        ("request_type", "unknown"),
+        ("storage_success", False),
+        ("storage_message", ""),
+    )
 
+    def _build_initial_state(self, user_message: str, user_id: str) -> Dict[str, Any]:
+        """Build the initial workflow state for one user message."""
+        state = self._INITIAL_STATE_TEMPLATE.copy()
+        state["user_input"] = {
+            "user_id": user_id,
+            "message": user_message,
+            "timestamp": datetime.now().isoformat(),
+        }
+        state["errors"] = []
+        # Bounded deque: append never reallocates and the graph's node
+        # count caps well under the maxlen (see graph._HISTORY_MAXLEN)
+        state["state_history"] = deque(maxlen=16)
+        return state
+
+    def _invoke_config(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Per-invocation config: one checkpoint thread per user."""
+        if self.checkpointer is None:
+            return None
+        return {"configurable": {"thread_id": user_id}}
+
+    def _finalize_request(
+        self,
+        result_state: Dict[str, Any],
+        user_message: str,
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """Extract the output dict from a result state and record history."""
+        output = {k: result_state.get(k, d) for k, d in self._RESULT_DEFAULTS}
+        approval = result_state.get("approval_result")
+        output["approval_status"] = approval.get("status", "N/A") if approval else "N/A"
+        output["state_history"] = list(result_state.get("state_history") or ())
+        output["errors"] = result_state.get("errors") or []
+
+        # Store in history (LRU: newest at the end, evict from the front).
+        # Reuse the submission timestamp instead of a second clock read, so
+        # user_input and the history record agree exactly
+        record = {
+            "user_id": user_id,
+            "user_message": user_message,
+            "timestamp": result_state.get("user_input", {}).get(
+                "timestamp", datetime.now().isoformat()
+            ),
+            "output": output,
+        }
+        if self.store_full_state:
+            if self.full_state_dir:
+                # Spill to disk: the state (docs, tool traces) is the
+                # largest per-request allocation and disk pages are
+                # reclaimable where heap objects are not
+                path = os.path.join(self.full_state_dir, f"{result_state['request_id']}.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(result_state, f, ensure_ascii=False, default=_json_default)
+                record["full_state_path"] = path
+            else:
+                # Quantize vectors / deflate long docs so the byte-capped
+                # LRU holds several times more entries per MB
+                record["full_state"] = _compact_state(result_state)
+
+        history = self.request_history
+        if self.max_history_bytes is not None:
+            # Sized once at insert; the cached value is subtracted on evict
+            record["_bytes"] = _deep_sizeof(record)
+            self._history_bytes += record["_bytes"]
+
+        history[result_state["request_id"]] = record
+        history.move_to_end(result_state["request_id"])
+        while len(history) > self.max_history or (
+            self.max_history_bytes is not None
+            and self._history_bytes > self.max_history_bytes
+            and len(history) > 1
+        ):
+            _, evicted = history.popitem(last=False)
+            self._history_bytes -= evicted.get("_bytes", 0)
+
+        # Telemetry via the logging module: the join/format only runs when
+        # a handler actually wants the record, unlike an unconditional print
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Processed %s type=%s path=%s errors=%d",
+                output["request_id"],
+                output["request_type"],
+                " → ".join(output["state_history"]),
+                len(output["errors"]),
+            )
+
+        return output
 
     def process_request(self, user_message: str, user_id: str = "user_001") -> Dict[str, Any]:
         """
@@ -96,50 +363,141 @@ class LangGraphOrchestrator:
             - state_history: List of nodes visited in the workflow
             - errors: Any errors encountered
         """
+        initial_state = self._build_initial_state(user_message, user_id)
+        result_state = self.graph.invoke(initial_state, self._invoke_config(user_id))
+        return self._finalize_request(result_state, user_message, user_id)
 
-        # Build initial state
-        initial_state: Dict[str, Any] = {
-            "user_input": {
-                "user_id": user_id,
-                "message": user_message,
-                "timestamp": datetime.now().isoformat(),
-            },
-            "request_type": "unknown",
-            "final_response": "",
-            "request_id": "",
-            "errors": [],
-            "state_history": [],
-            "storage_success": False,
-            "storage_message": "",
-        }
+    async def aprocess_request(self, user_message: str, user_id: str = "user_001") -> Dict[str, Any]:
+        """
+        Async variant of process_request for concurrent callers.
 
-        # Execute the graph
-        result_state = self.graph.invoke(initial_state)
-
-        # Extract relevant results
-        output = {
-            "final_response": result_state.get("final_response", ""),
-            "request_id": result_state.get("request_id", ""),
-            "request_type": result_state.get("request_type", "unknown"),
-            "approval_status": result_state.get("approval_result", {}).get("status", "N/A"),
-            "storage_success": result_state.get("storage_success", False),
-            "storage_message": result_state.get("storage_message", ""),
-            "state_history": result_state.get("state_history", []),
-            "errors": result_state.get("errors", []),
-        }
+        Awaiting the graph lets one event loop overlap the LLM/Telegram/DB
+        waits of many in-flight requests; the returned dict is identical to
+        process_request's.
 
-        # Store in history
-        self.request_history[result_state["request_id"]] = {
-            "user_id": user_id,
-            "user_message": user_message,
-            "timestamp": datetime.now().isoformat(),
-            "output": output,
-            "full_state": result_state,
-        }
+        Identical (user_id, message) pairs that arrive while the first is
+        still running are coalesced onto its future - read-only requests
+        (info, status) are idempotent, so the duplicate graph run would
+        only burn an extra LLM/RAG round-trip. Reservation-style messages
+        are side-effecting and always get their own invocation.
+        """
+        # Gate on the router's own classifier (memoized), not a prefix
+        # heuristic: "book", "бронь" etc. are side-effecting too, and two
+        # coalesced reservations would silently drop one admin submission
+        from src.stage4.graph import _classify
+
+        key = None
+        if _classify(user_message.lower().strip())[0] != "reservation":
+            key = hashlib.blake2b(
+                f"{user_id}|{user_message}".encode(), digest_size=16
+            ).digest()
+            pending = self._inflight.get(key)
+            if pending is not None:
+                return await pending
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._inflight[key] = future
+        try:
+            initial_state = self._build_initial_state(user_message, user_id)
+            result_state = await self.graph.ainvoke(initial_state, self._invoke_config(user_id))
+            output = self._finalize_request(result_state, user_message, user_id)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # consume so no "never retrieved" warning
+            raise
+        else:
+            future.set_result(output)
+            return output
+        finally:
+            if key is not None:
+                self._inflight.pop(key, None)
+
+
+    async def astream_request(self, user_message: str, user_id: str = "user_001"):
+        """
+        Stream the workflow for one request, yielding (node_name, state).
+
+        Each yield is the full state after another node ran, so callers
+        can surface partial output (final_response grows in the response
+        node) before the whole graph finishes - perceived latency drops
+        to the first emitting node. The stream does not record request
+        history; pass the last yielded state to _finalize_request (as
+        interactive_mode does) or use aprocess_request instead.
+        """
+        initial_state = self._build_initial_state(user_message, user_id)
+        config = self._invoke_config(user_id)
+        async for state in self.graph.astream(initial_state, config, stream_mode="values"):
+            history = state.get("state_history") or []
+            yield (history[-1] if history else "start", state)
 
+    def _stream_response(self, user_message: str, user_id: str) -> Dict[str, Any]:
+        """
+        Process one request, printing final_response deltas as they appear.
 
-        return output
+        Used by interactive_mode so the user sees output as soon as the
+        response node emits it rather than after the graph completes.
+        Returns the same output dict as process_request and records the
+        request in history.
+        """
 
+        async def _run():
+            printed = ""
+            last_state = None
+            async for _node, state in self.astream_request(user_message, user_id):
+                full = state.get("final_response") or ""
+                if full and full != printed:
+                    sys.stdout.write(full[len(printed):])
+                    sys.stdout.flush()
+                    printed = full
+                last_state = state
+            return last_state
+
+        result_state = asyncio.run(_run())
+        return self._finalize_request(result_state or {}, user_message, user_id)
+
+    def process_batch(self, items: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Process several requests at once for bulk replay and evaluation runs.
+
+        Args:
+            items: List of (user_message, user_id) pairs
+
+        Returns:
+            List of output dicts, one per item, in input order. Info-type
+            requests share one batched embedding + FAISS search via
+            GraphWithResources.invoke_batch; other types run individually.
+        """
+        states = [self._build_initial_state(message, user_id) for message, user_id in items]
+        result_states = self.graph.invoke_batch(states)
+        return [
+            self._finalize_request(result_state, message, user_id)
+            for result_state, (message, user_id) in zip(result_states, items)
+        ]
+
+    async def aprocess_batch(
+        self,
+        items: List[tuple],
+        concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of process_batch with bounded concurrency.
+
+        Args:
+            items: List of (user_message, user_id) pairs
+            concurrency: Max requests in flight (default: ORCH_CONCURRENCY
+                env var, else 8) - caps pressure on the OpenAI/Telegram APIs
+
+        Returns:
+            List of output dicts in input order
+        """
+        if concurrency is None:
+            concurrency = int(os.getenv("ORCH_CONCURRENCY", "8"))
+        from src.stage4._async_utils import bounded_gather
+        return await bounded_gather(
+            (self.aprocess_request(message, user_id) for message, user_id in items),
+            n=concurrency,
+        )
 
     def get_request_status(self, request_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -151,10 +509,44 @@ class LangGraphOrchestrator:
         Returns:
             Dictionary with request information, or None if not found
         """
-        if request_id in self.request_history:
-            return self.request_history[request_id]
+        record = self.request_history.get(request_id)
+        if record is not None:
+            self._history_hits += 1
+            self.request_history.move_to_end(request_id)  # reads refresh LRU order
+            return record
+        self._history_misses += 1
         return None
 
+    def load_full_state(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Load a request's full workflow state, from memory or spill file."""
+        record = self.request_history.get(request_id)
+        if record is None:
+            return None
+        if "full_state" in record:
+            return _expand_state(record["full_state"])
+        path = record.get("full_state_path")
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def history_info(self) -> Dict[str, int]:
+        """Hit/miss/size counters for the request-history LRU."""
+        return {
+            "hits": self._history_hits,
+            "misses": self._history_misses,
+            "currsize": len(self.request_history),
+            "maxsize": self.max_history,
+            "rss_bytes": self._history_bytes,
+        }
+
+    def rag_cache_info(self) -> Dict[str, int]:
+        """Hit/miss/size counters for the graph's RAG answer cache."""
+        cache = self.graph._resources.rag_answer_cache
+        if cache is None:
+            return {"hits": 0, "misses": 0, "currsize": 0, "maxsize": 0}
+        return cache.cache_info()
+
 
     def list_requests(self) -> List[Dict[str, Any]]:
         """
@@ -196,13 +588,23 @@ class LangGraphOrchestrator:
                 print(f"   Saved: {'✅' if req['storage_success'] else '❌'}")
             print()
 
-    def close(self):
-        """Close resources and cleanup (especially Telegram bot)."""
-        if self.admin_agent:
-            try:
-                self.admin_agent.close()
-            except Exception as e:
-                print(f"⚠️  Error closing admin agent: {e}")
+    def close(self, wait: bool = False):
+        """
+        Close resources and cleanup (especially Telegram bot).
+
+        The close runs on a background pool so the caller is not blocked
+        by the Telegram polling drain; pass wait=True to block until it
+        finishes. Closes still pending at interpreter exit are awaited
+        by an atexit hook.
+        """
+        agent = self.admin_agent
+        if agent is None:
+            return
+        self.admin_agent = None
+        future = _shutdown_executor.submit(_close_agent, agent)
+        _shutdown_futures.append(future)
+        if wait:
+            future.result()
 
     def cleanup_resources(self):
         """Alias for close() - cleanup all resources."""
@@ -273,10 +675,12 @@ class LangGraphOrchestrator:
                     print("-"*80 + "\n")
                     continue
 
-                # Process the request
-                result = self.process_request(user_input, user_id)
-
-                print(f"\nBot: {result['final_response']}\n")
+                # Process the request, streaming the response as the
+                # graph emits it instead of waiting for completion
+                sys.stdout.write("\nBot: ")
+                sys.stdout.flush()
+                result = self._stream_response(user_input, user_id)
+                print("\n")
 
                 # Show metadata if requested
                 if "debug" in user_input.lower():
@@ -299,6 +703,83 @@ class LangGraphOrchestrator:
                 continue
 
 
+class BatchedOrchestrator:
+    """
+    Micro-batches concurrent requests into shared graph invocations.
+
+    Fronted by a web endpoint, concurrent submit() calls land in one
+    queue; the flusher drains it when batch_size requests are waiting or
+    the oldest has waited max_wait_ms, then runs the whole batch through
+    LangGraphOrchestrator.process_batch (which coalesces the info-type
+    RAG work). At low load a request waits at most max_wait_ms; at high
+    load per-call overhead is amortized across the batch.
+    """
+
+    def __init__(
+        self,
+        orchestrator: LangGraphOrchestrator,
+        batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+    ):
+        self.orchestrator = orchestrator
+        self.batch_size = batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background flusher (call once, from the event loop)."""
+        self._queue = asyncio.Queue()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def submit(self, user_message: str, user_id: str = "user_001") -> Dict[str, Any]:
+        """Enqueue one request and await its output dict."""
+        if self._queue is None:
+            raise RuntimeError("BatchedOrchestrator not started - call start() first")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((user_message, user_id, future))
+        return await future
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first request, then top the batch up until
+            # either it is full or the first entry has aged out
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_sec
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [(message, user_id) for message, user_id, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.orchestrator.process_batch, items)
+            except Exception as e:  # propagate to every waiter, keep flushing
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the flusher; pending submits are cancelled."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+
 def create_orchestrator(
     use_llm: bool = False,
     use_telegram: bool = False,
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import sys
 
 # Ensure project root is on sys.path so `src` package can be imported during tests
@@ -6,3 +7,13 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+# Under pytest-xdist (pytest -n auto), give each worker its own
+# reservations database: SQLite serializes writers per file, so sharing
+# one file across workers would turn parallel tests into SQLITE_BUSY
+# retries. Single-process runs keep the default path.
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker:
+    os.environ.setdefault(
+        "RESERVATIONS_DB_PATH",
+        os.path.join(tempfile.gettempdir(), f"test_reservations_{_worker}.db"),
+    )
@@ -44,6 +44,58 @@ def test_simple_rag_answer():
         assert "similarity" in ans.lower() or "location" in ans.lower() or "parking" in ans.lower()
 
 
+def test_documentstore_retrieve_batch_matches_single():
+    """Test that batched retrieval returns the same hits as per-query calls."""
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "static_docs.txt")
+    path = os.path.abspath(path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = DocumentStore.from_file(path, db_path=tmpdir)
+        queries = ["pricing", "working hours"]
+        batch = store.retrieve_batch(queries, k=2)
+
+        assert len(batch) == 2
+        for hits, query in zip(batch, queries):
+            single = store.retrieve(query, k=2)
+            assert [i for i, _ in hits] == [i for i, _ in single]
+            for (_, s_batch), (_, s_single) in zip(hits, single):
+                assert abs(s_batch - s_single) < 1e-5
+
+
+def test_answer_batch_matches_answer_count():
+    """Test that answer_batch produces one non-empty answer per query."""
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "static_docs.txt")
+    path = os.path.abspath(path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = DocumentStore.from_file(path, db_path=tmpdir)
+        bot = SimpleRAGChatbot(store)
+        queries = ["where is the parking", "what is the price"]
+        answers = bot.answer_batch(queries, k=2)
+
+        assert len(answers) == 2
+        for ans in answers:
+            assert len(ans) > 0
+            assert "similarity" in ans.lower()
+
+
+def test_embedding_cache_hits_on_repeat_query():
+    """Test that repeated queries reuse the cached embedding."""
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "static_docs.txt")
+    path = os.path.abspath(path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = DocumentStore.from_file(path, db_path=tmpdir)
+        store.retrieve("pricing", k=1)
+        store.retrieve("pricing", k=1)
+
+        info = store._encode_query.cache_info()
+        assert info.hits >= 1
+
+        store.clear_embedding_cache()
+        assert store._encode_query.cache_info().hits == 0
+
+
 def test_dynamic_data_included():
     """Test that dynamic parking data is included in the answer."""
     path = os.path.join(os.path.dirname(__file__), "..", "data", "static_docs.txt")
@@ -8,17 +8,13 @@ Tests for SQLite reservation storage functionality:
 - Data validation and integrity
 """
 
+import dataclasses
+
 import pytest
 import sqlite3
-import tempfile
-import os
-import sys
-from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.stage3.storage import ReservationStorage
+from src.stage3.storage import Reservation, ReservationStorage
 from src.stage3.integrate import process_approved_reservation, get_all_approved_reservations
 
 
@@ -26,38 +22,46 @@ from src.stage3.integrate import process_approved_reservation, get_all_approved_
 # FIXTURES
 # ============================================================================
 
-@pytest.fixture
-def temp_db_path():
-    """Create a temporary database path for testing."""
-    tmpdir = tempfile.mkdtemp()
-    db_path = os.path.join(tmpdir, "test_reservations.db")
-    yield db_path
-    # Cleanup
-    try:
-        if os.path.exists(db_path):
-            os.remove(db_path)
-        os.rmdir(tmpdir)
-    except:
-        pass
+@pytest.fixture(scope="session")
+def _session_db_path():
+    """
+    One in-memory database for the whole session; tests reset rows.
+
+    Nothing here needs durability, so the shared-cache URI form keeps
+    the database purely in memory while still being visible to the
+    short-lived connections ReservationStorage opens per call. The
+    keeper connection pins the database alive for the session.
+    """
+    uri = "file:stage3-tests?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True)
+    yield uri
+    keeper.close()
 
 
 @pytest.fixture
-def storage(temp_db_path):
-    """Create a ReservationStorage instance with temporary database."""
-    return ReservationStorage(db_path=temp_db_path)
+def storage(_session_db_path):
+    """ReservationStorage on the shared database, emptied after each test."""
+    storage = ReservationStorage(db_path=_session_db_path)
+    yield storage
+    # Row delete instead of file recreate: schema init and all file I/O
+    # are gone; per-test reset is one in-memory DELETE
+    with storage._connect() as conn:
+        conn.execute("DELETE FROM reservations")
+        conn.commit()
+    storage.close()
 
 
 @pytest.fixture
 def sample_reservation():
-    """Sample approved reservation."""
-    return {
-        "reservation_id": "REQ-20260225100000-001",
-        "user_name": "John Doe",
-        "car_number": "ABC123",
-        "start_date": "2026-03-01",
-        "end_date": "2026-03-07",
-        "approval_time": "2026-02-25T10:00:00",
-    }
+    """Sample approved reservation (frozen; vary via dataclasses.replace)."""
+    return Reservation(
+        reservation_id="REQ-20260225100000-001",
+        user_name="John Doe",
+        car_number="ABC123",
+        start_date="2026-03-01",
+        end_date="2026-03-07",
+        approval_time="2026-02-25T10:00:00",
+    )
 
 
 # ============================================================================
@@ -68,12 +72,13 @@ class TestDatabaseInit:
     """Test database initialization and table creation."""
 
     def test_database_creation(self, storage):
-        """Test that database file is created."""
-        assert storage.db_path.exists()
+        """Test that the database is reachable after init."""
+        with storage._connect() as conn:
+            assert conn.execute("SELECT 1").fetchone() == (1,)
 
     def test_table_exists(self, storage):
         """Test that reservations table exists."""
-        with sqlite3.connect(storage.db_path) as conn:
+        with storage._connect() as conn:
             cursor = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='reservations'"
             )
@@ -96,7 +101,7 @@ class TestSaveReservation:
         """Test that saved reservation is persisted."""
         storage.save(sample_reservation)
 
-        retrieved = storage.get_by_id(sample_reservation["reservation_id"])
+        retrieved = storage.get_by_id(sample_reservation.reservation_id)
         assert retrieved is not None
         assert retrieved["user_name"] == "John Doe"
 
@@ -112,7 +117,7 @@ class TestGetReservations:
         """Test getting reservation by ID."""
         storage.save(sample_reservation)
 
-        retrieved = storage.get_by_id(sample_reservation["reservation_id"])
+        retrieved = storage.get_by_id(sample_reservation.reservation_id)
         assert retrieved is not None
         assert retrieved["user_name"] == "John Doe"
         assert retrieved["car_number"] == "ABC123"
@@ -147,8 +152,7 @@ class TestGetReservations:
             "approval_time": "2026-02-25T11:00:00",
         }
 
-        storage.save(res1)
-        storage.save(res2)
+        assert storage.save_many([res1, res2]) is True
 
         all_reservations = storage.get_all()
         assert len(all_reservations) == 2
@@ -166,8 +170,7 @@ class TestDataIntegrity:
         storage.save(sample_reservation)
 
         # Try to save with same ID but different data
-        modified = sample_reservation.copy()
-        modified["user_name"] = "Jane Doe"
+        modified = dataclasses.replace(sample_reservation, user_name="Jane Doe")
         storage.save(modified)
 
         # Should still have 1 record
@@ -177,7 +180,7 @@ class TestDataIntegrity:
     def test_required_fields_stored(self, storage, sample_reservation):
         """Test that required fields are stored."""
         storage.save(sample_reservation)
-        retrieved = storage.get_by_id(sample_reservation["reservation_id"])
+        retrieved = storage.get_by_id(sample_reservation.reservation_id)
 
         assert retrieved["user_name"] == "John Doe"
         assert retrieved["car_number"] == "ABC123"
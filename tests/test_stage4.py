@@ -10,13 +10,10 @@ Comprehensive tests for the orchestration system:
 """
 
 import pytest
-import os
-import sys
 from datetime import datetime
+from typing import Final
 from unittest.mock import Mock, patch, MagicMock
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.stage4.orchestrator import LangGraphOrchestrator, create_orchestrator
 from src.stage4.graph import (
@@ -26,16 +23,39 @@ from src.stage4.graph import (
 )
 
 
+# Shared edge-case messages: built once at import and reusable by
+# parametrized tests
+_LONG_MSG: Final[str] = "a" * 1000
+_SPECIAL_MSG: Final[str] = "What's the price? @#$%^&*()"
+_UNICODE_MSG: Final[str] = "Привет! 你好! مرحبا"
+
+
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def orchestrator():
-    """Create an orchestrator instance for testing."""
+    """
+    One orchestrator for the whole module.
+
+    Building the graph (RAG store, embedding model, storage) dominates
+    setup; the tests only invoke it and inspect outputs, so it is shared
+    and per-test state is reset by _reset_orchestrator below.
+    """
     return create_orchestrator(use_llm=False, use_telegram=False, verbose=False)
 
 
+@pytest.fixture(autouse=True)
+def _reset_orchestrator(request):
+    """Clear shared-orchestrator request history after tests that used it."""
+    yield
+    orch = getattr(request.node, "funcargs", {}).get("orchestrator")
+    if orch is not None:
+        orch.request_history.clear()
+        orch._history_bytes = 0
+
+
 @pytest.fixture
 def sample_info_request():
     """Sample info request."""
@@ -128,23 +148,17 @@ class TestInfoRequests:
         assert 'approval' not in result['state_history']
         assert 'storage' not in result['state_history']
 
-    def test_multiple_info_requests(self, orchestrator):
-        """Test processing multiple info requests."""
-        requests = [
-            "What are the prices?",
-            "Where is the parking located?",
-            "What are the working hours?"
-        ]
-
-        results = []
-        for req in requests:
-            result = orchestrator.process_request(req)
-            results.append(result)
-
-        assert len(results) == 3
-        # All requests should produce responses (type may vary)
-        for result in results:
-            assert result['final_response'] != ''
+    @pytest.mark.parametrize("req", [
+        "What are the prices?",
+        "Where is the parking located?",
+        "What are the working hours?"
+    ])
+    def test_multiple_info_requests(self, orchestrator, req):
+        """Test processing each info request (parametrized: cases fail
+        independently and distribute across pytest-xdist workers)."""
+        result = orchestrator.process_request(req)
+        # Each request should produce a response (type may vary)
+        assert result['final_response'] != ''
 
 
 # ============================================================================
@@ -180,12 +194,22 @@ class TestReservationRequests:
         assert 'approval' in state_history
 
     def test_approved_reservation_saves_to_storage(self, orchestrator, sample_reservation_request):
-        """Test that approved reservations are saved to storage."""
-        result = orchestrator.process_request(sample_reservation_request)
+        """Test that approved reservations reach the storage node."""
+        from src.stage4.graph import _storage_executor
+
+        # Stub the save so the test asserts workflow routing without a
+        # real SQLite write; the executor flush keeps the patch active
+        # until the background save has actually run (single worker, FIFO)
+        with patch.object(
+            orchestrator.graph._resources.storage, "save", return_value=True
+        ) as mock_save:
+            result = orchestrator.process_request(sample_reservation_request)
+            _storage_executor.submit(lambda: None).result()
 
-        # With simulated auto-approve, this should be approved and saved
-        if result['approval_status'] == 'approved':
-            assert 'storage' in result['state_history']
+            # With simulated auto-approve, this should be approved and saved
+            if result['approval_status'] == 'approved':
+                assert 'storage' in result['state_history']
+                mock_save.assert_called_once()
 
 
 # ============================================================================
@@ -322,24 +346,21 @@ class TestErrorHandling:
 
     def test_very_long_message(self, orchestrator):
         """Test handling of very long messages."""
-        long_message = "a" * 1000
-        result = orchestrator.process_request(long_message)
+        result = orchestrator.process_request(_LONG_MSG)
 
         assert result is not None
         assert 'final_response' in result
 
     def test_special_characters_handling(self, orchestrator):
         """Test handling of special characters."""
-        special_message = "What's the price? @#$%^&*()"
-        result = orchestrator.process_request(special_message)
+        result = orchestrator.process_request(_SPECIAL_MSG)
 
         assert result is not None
         assert 'final_response' in result
 
     def test_unicode_handling(self, orchestrator):
         """Test handling of unicode characters."""
-        unicode_message = "Привет! 你好! مرحبا"
-        result = orchestrator.process_request(unicode_message)
+        result = orchestrator.process_request(_UNICODE_MSG)
 
         assert result is not None
         assert 'final_response' in result
@@ -410,29 +431,23 @@ class TestPerformanceMetrics:
         """Test that request processing completes within reasonable time."""
         import time
 
-        start_time = time.time()
+        # perf_counter_ns is monotonic and high-resolution; time.time()
+        # is wall-clock and can jump (NTP), making the guard flaky
+        start = time.perf_counter_ns()
         result = orchestrator.process_request("test request")
-        elapsed = time.time() - start_time
+        elapsed_ns = time.perf_counter_ns() - start
 
         # Should complete in reasonable time (< 10 seconds)
-        assert elapsed < 10.0
+        assert elapsed_ns < 10_000_000_000
         assert result is not None
 
-    def test_multiple_requests_throughput(self, orchestrator):
-        """Test throughput of multiple sequential requests."""
-        import time
-
-        num_requests = 5
-        start_time = time.time()
-
-        for i in range(num_requests):
-            orchestrator.process_request(f"Request {i}")
-
-        elapsed = time.time() - start_time
-        throughput = num_requests / elapsed if elapsed > 0 else 0
+    @pytest.mark.parametrize("i", range(5))
+    def test_multiple_requests_throughput(self, orchestrator, i):
+        """Test that each of several requests processes and is recorded."""
+        result = orchestrator.process_request(f"Request {i}")
 
-        # Should handle at least a few requests per second
-        assert len(orchestrator.request_history) == num_requests
+        assert result['request_id'] != ''
+        assert result['request_id'] in orchestrator.request_history
 
 
 # ============================================================================
@@ -460,6 +475,190 @@ class TestMockIntegration:
             assert result['approval_status'] != 'unknown'
 
 
+# ============================================================================
+# TEST: Batch Invocation
+# ============================================================================
+
+class TestBatchInvocation:
+    """Test GraphWithResources.invoke_batch."""
+
+    @staticmethod
+    def _initial_state(message, user_id="user_001"):
+        """Build an initial state the way the orchestrator does."""
+        return {
+            "user_input": {
+                "user_id": user_id,
+                "message": message,
+                "timestamp": datetime.now().isoformat(),
+            },
+            "request_type": "unknown",
+            "final_response": "",
+            "request_id": "",
+            "errors": [],
+            "state_history": [],
+            "storage_success": False,
+            "storage_message": "",
+        }
+
+    def test_batch_results_match_invoke(self, orchestrator):
+        """Test that batched info requests follow the same node path as invoke."""
+        message = "What are the parking prices?"
+        single = orchestrator.graph.invoke(self._initial_state(message))
+        batch = orchestrator.graph.invoke_batch([self._initial_state(message)])
+
+        assert len(batch) == 1
+        assert batch[0]["request_type"] == single["request_type"] == "info"
+        assert batch[0]["state_history"] == single["state_history"]
+        assert batch[0]["final_response"] != ""
+
+    def test_batch_does_not_mutate_caller_state(self, orchestrator):
+        """Test that the caller's initial states are left untouched."""
+        states = [
+            self._initial_state("What are the prices?"),
+            self._initial_state("I want to reserve a parking space"),
+        ]
+
+        orchestrator.graph.invoke_batch(states)
+
+        for state in states:
+            assert state["state_history"] == []
+            assert state["errors"] == []
+
+    def test_batch_handles_mixed_request_types(self, orchestrator):
+        """Test that non-info requests still go through the full graph."""
+        states = [
+            self._initial_state("What are the prices?"),
+            self._initial_state("I want to reserve a parking space"),
+        ]
+
+        results = orchestrator.graph.invoke_batch(states)
+
+        assert len(results) == 2
+        assert results[0]["request_type"] == "info"
+        assert results[1]["request_type"] == "reservation"
+        # No duplicated initialize/router from the pre-routing probe
+        assert results[1]["state_history"].count("initialize") == 1
+        assert results[1]["state_history"].count("router") == 1
+        assert "approval" in results[1]["state_history"]
+
+
+# ============================================================================
+# TEST: ID Generation
+# ============================================================================
+
+class TestMakeId:
+    """Test the counter-based workflow ID generator."""
+
+    def test_ids_are_unique(self):
+        """Test that successive IDs never collide."""
+        from src.stage4.graph import _make_id
+
+        ids = {_make_id("FLOW") for _ in range(100)}
+        assert len(ids) == 100
+
+    def test_prefixes_have_independent_counters(self):
+        """Test that FLOW ids do not perturb REQ numbering."""
+        import re
+        from src.stage4.graph import _make_id
+
+        _make_id("FLOW")
+        req_id = _make_id("REQ", "03d", max_counter=999)
+        _make_id("FLOW")
+        req_id2 = _make_id("REQ", "03d", max_counter=999)
+
+        n1 = int(req_id.rsplit("-", 1)[1])
+        n2 = int(req_id2.rsplit("-", 1)[1])
+        assert n2 == n1 % 999 + 1
+
+    def test_req_id_matches_status_check_pattern(self):
+        """Test that generated REQ ids round-trip through the status regex."""
+        from src.stage4.graph import _REQ_ID_RE, _make_id
+
+        for _ in range(5):
+            req_id = _make_id("REQ", "03d", max_counter=999)
+            assert _REQ_ID_RE.fullmatch(req_id), req_id
+
+
+# ============================================================================
+# TEST: RAG Answer Cache
+# ============================================================================
+
+class TestRAGAnswerCache:
+    """Test the exact-match + semantic answer cache (no model needed)."""
+
+    def test_exact_hit_without_embedding(self):
+        """Test that a literal repeat question hits without an embedding."""
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache()
+        cache.put("what are the prices?", "answer A")
+
+        assert cache.get("what are the prices?") == "answer A"
+
+    def test_miss_returns_none(self):
+        """Test that an unknown question misses."""
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache()
+        assert cache.get("never seen") is None
+
+    def test_semantic_hit_above_threshold(self):
+        """Test that a near-identical embedding reuses the cached answer."""
+        import numpy as np
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache(similarity_threshold=0.95)
+        base = np.array([1.0, 0.0, 0.0])
+        cache.put("query one", "answer A", embedding=base)
+
+        close = np.array([0.999, 0.01, 0.0])
+        assert cache.get("query two", embedding=close) == "answer A"
+
+    def test_semantic_miss_below_threshold(self):
+        """Test that a dissimilar embedding does not reuse the answer."""
+        import numpy as np
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache(similarity_threshold=0.95)
+        cache.put("query one", "answer A", embedding=np.array([1.0, 0.0, 0.0]))
+
+        assert cache.get("query two", embedding=np.array([0.0, 1.0, 0.0])) is None
+
+    def test_entries_expire_after_ttl(self):
+        """Test that expired entries are treated as misses."""
+        import time
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache(ttl_sec=0.01)
+        cache.put("what are the prices?", "answer A")
+        time.sleep(0.02)
+
+        assert cache.get("what are the prices?") is None
+
+    def test_clear_drops_all_layers(self):
+        """Test that clear() empties both cache layers."""
+        import numpy as np
+        from src.stage4.graph import _RAGAnswerCache
+
+        cache = _RAGAnswerCache()
+        emb = np.array([1.0, 0.0])
+        cache.put("query", "answer", embedding=emb)
+        cache.clear()
+
+        assert cache.get("query") is None
+        assert cache.get("other", embedding=emb) is None
+
+    def test_caches_are_per_configuration(self):
+        """Test that each (use_llm, use_telegram) config has its own cache."""
+        from src.stage4.graph import _get_rag_answer_cache
+
+        cache_no_llm = _get_rag_answer_cache(use_llm=False, use_telegram=False)
+        cache_llm = _get_rag_answer_cache(use_llm=True, use_telegram=False)
+
+        assert cache_no_llm is not cache_llm
+        assert _get_rag_answer_cache(use_llm=False, use_telegram=False) is cache_no_llm
+
+
 # ============================================================================
 # Run tests if executed directly
 # ============================================================================